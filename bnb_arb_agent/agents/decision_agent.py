@@ -1,9 +1,28 @@
 """Arbitrage decision engine — evaluates sentiment and price signals to produce a trade action."""
 
+import asyncio
+import functools
+import logging
+import math
+import os
+import queue
+import re
+import sys
+import threading
+import time
+from bisect import bisect_right
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, fields
 from datetime import datetime
-from typing import Optional
+from enum import IntEnum
+from typing import Any, Optional
 
+import aiohttp
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from agents.execution_agent import ExecutionAgent
 from config import Config
@@ -14,75 +33,321 @@ from tools.price_fetcher import DEXPriceFetcher
 logger = get_logger(__name__)
 config = Config()
 
-_CEX_URL = "https://api.coingecko.com/api/v3/simple/price?ids={coin_id}&vs_currencies=usd&include_24hr_change=true"
+_CEX_URL_BASE = config.coingecko_cache_url.rstrip("/") or "https://api.coingecko.com/api/v3"
+_CEX_URL      = _CEX_URL_BASE + "/simple/price?ids={coin_ids}&vs_currencies=usd&include_24hr_change=true"
 
 
-def _cex_price(token: str) -> dict:
-    coin_id = COINGECKO_IDS.get(token, token.lower())
+# Symbol -> CoinGecko id; unknown symbols fall back to their lower-cased name
+# and are memoised on first use. Keys are interned so lookups with the
+# (equally interned) configured symbols short-circuit on identity.
+_ID_FOR: dict[str, str] = {sys.intern(symbol): coin_id for symbol, coin_id in COINGECKO_IDS.items()}
+
+_CEX_TTL_SECONDS = 4.0
+
+_HEADERS = {"User-Agent": "Mozilla/5.0 (compatible; BNBArbBot/1.0)"}
+
+# Keep-alive session so repeat CoinGecko calls reuse the TLS connection; 429s
+# and gateway errors are retried with backoff by the adapter.
+_SESSION = requests.Session()
+_SESSION.headers.update(_HEADERS)
+_ADAPTER = HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=8,
+    max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=[429, 502, 503, 504]),
+)
+_SESSION.mount("https://", _ADAPTER)
+_SESSION.mount("http://", _ADAPTER)
+
+_IO_TIMEOUT_SECONDS = 8
+
+# A token with no sentiment signal whose last fetched prices were within the
+# smallest price-only arb trigger (0.3% in _decide) cannot leave HOLD, so on the
+# next tick its last prices are reused instead of going back to the network.
+# The age cap (one poll interval plus slack) also bounds reuse for callers
+# that never call start_tick().
+_QUIET_MAX_PRICE_DIFF = 0.003
+_QUIET_MAX_AGE_SECONDS = 1.5 * config.poll_interval_seconds
+
+# CEX and DEX lookups are blocking network calls; running them side by side
+# bounds evaluation latency by the slower of the two rather than their sum.
+_IO_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="price-io")
+
+# token -> (monotonic fetch time, price dict); shared by every agent in the process.
+_cex_cache: dict[str, tuple[float, dict]] = {}
+
+
+def clear_cex_cache() -> None:
+    _cex_cache.clear()
+
+
+@functools.lru_cache(maxsize=64)
+def _cex_url(coin_ids: tuple[str, ...]) -> str:
+    """Build (once per distinct id set) the batched /simple/price URL."""
+    return _CEX_URL.format(coin_ids=",".join(coin_ids))
+
+
+def _split_cached(tokens: list[str], now: float) -> tuple[dict[str, dict], dict[str, str]]:
+    """Return fresh cached prices and a symbol -> CoinGecko id map of tokens still to fetch."""
+    prices = {
+        token: cached[1]
+        for token in tokens
+        if (cached := _cex_cache.get(token)) and now - cached[0] < _CEX_TTL_SECONDS
+    }
+    coin_ids = {
+        token: _ID_FOR.get(token) or _ID_FOR.setdefault(sys.intern(token), token.lower())
+        for token in tokens
+        if token not in prices
+    }
+    return prices, coin_ids
+
+
+def _store_cex_prices(prices: dict[str, dict], coin_ids: dict[str, str], data: dict, now: float) -> dict[str, dict]:
+    for token, coin_id in coin_ids.items():
+        entry = data.get(coin_id, {})
+        prices[token] = {"price": entry.get("usd", 0.0), "change_24h": entry.get("usd_24h_change", 0.0)}
+        _cex_cache[token] = (now, prices[token])
+    return prices
+
+
+def _failed_cex_prices(prices: dict[str, dict], coin_ids: dict[str, str]) -> dict[str, dict]:
+    logger.warning("CEX price fetch failed for %s.", ", ".join(coin_ids))
+    return prices | {token: {"price": 0.0, "change_24h": 0.0} for token in coin_ids}
+
+
+def fetch_cex_prices(tokens: list[str]) -> dict[str, dict]:
+    """Fetch CEX prices for *tokens* with a single CoinGecko request, keyed by symbol.
+
+    Prices fetched within the last few seconds are served from memory; only
+    the remaining tokens go over the network.
+    """
+    now              = time.monotonic()
+    prices, coin_ids = _split_cached(tokens, now)
+    if not coin_ids:
+        return prices
+
     try:
-        response = requests.get(_CEX_URL.format(coin_id=coin_id), timeout=6)
+        response = _SESSION.get(_cex_url(tuple(dict.fromkeys(coin_ids.values()))), timeout=6)
         response.raise_for_status()
-        data = response.json().get(coin_id, {})
-        return {"price": data.get("usd", 0.0), "change_24h": data.get("usd_24h_change", 0.0)}
+        data = orjson.loads(response.content)
+    except Exception:
+        return _failed_cex_prices(prices, coin_ids)
+
+    return _store_cex_prices(prices, coin_ids, data, now)
+
+
+async def fetch_cex_prices_async(tokens: list[str], session: aiohttp.ClientSession) -> dict[str, dict]:
+    """Async counterpart of fetch_cex_prices() over a caller-owned aiohttp session."""
+    now              = time.monotonic()
+    prices, coin_ids = _split_cached(tokens, now)
+    if not coin_ids:
+        return prices
+
+    try:
+        async with session.get(
+            _cex_url(tuple(dict.fromkeys(coin_ids.values()))),
+            headers=_HEADERS,
+            timeout=aiohttp.ClientTimeout(total=6),
+        ) as response:
+            response.raise_for_status()
+            data = orjson.loads(await response.read())
+    except Exception:
+        return _failed_cex_prices(prices, coin_ids)
+
+    return _store_cex_prices(prices, coin_ids, data, now)
+
+
+def _cex_price(token: str) -> dict:
+    return fetch_cex_prices([token])[token]
+
+
+_TIMESTAMP_TTL_SECONDS = 0.1
+
+# (epoch seconds, ISO string) of the last formatted timestamp.
+_ts_cache: tuple[float, str] = (0.0, "")
+
+
+def _now_iso() -> str:
+    """Return the current UTC time in ISO format, reused for up to 100 ms."""
+    global _ts_cache
+    now = time.time()
+    if now - _ts_cache[0] >= _TIMESTAMP_TTL_SECONDS:
+        _ts_cache = (now, datetime.utcnow().isoformat())
+    return _ts_cache[1]
+
+
+def _await_price(future: Future, default: Any, source: str, token: str) -> Any:
+    try:
+        return future.result(timeout=_IO_TIMEOUT_SECONDS)
     except Exception:
-        logger.warning("CEX price fetch failed for %s.", token)
-        return {"price": 0.0, "change_24h": 0.0}
+        logger.warning("%s price fetch failed for %s.", source, token)
+        return default
+
+
+async def _await_price_async(awaitable, default: Any, source: str, token: str) -> Any:
+    try:
+        return await asyncio.wait_for(awaitable, timeout=_IO_TIMEOUT_SECONDS)
+    except Exception:
+        logger.warning("%s price fetch failed for %s.", source, token)
+        return default
+
+
+class Urgency(IntEnum):
+    LOW    = 0
+    MEDIUM = 1
+    HIGH   = 2
+
+
+class RiskLevel(IntEnum):
+    LOW    = 0
+    MEDIUM = 1
+    HIGH   = 2
+
+
+class MarketPhase(IntEnum):
+    UNKNOWN                   = 0
+    MOMENTUM_BUILDING         = 1
+    ACCUMULATION_PHASE        = 2
+    DISTRIBUTION_PHASE        = 3
+    VOLATILITY_SPIKE_INCOMING = 4
+
+
+def _enum_member(enum_cls: type[IntEnum], raw: str, default: IntEnum) -> IntEnum:
+    """Look *raw* up by member name; unknown values fall back to *default* and are logged."""
+    member = enum_cls.__members__.get(raw)
+    if member is not None:
+        return member
+    if raw:
+        logger.debug("Unknown %s %r — using %s.", enum_cls.__name__, raw, default.name)
+    return default
+
+
+_GEMINI_FIELD_RE = re.compile(r"^[^:\n]*?(SIGNAL_TYPE|URGENCY|ARB_OPPORTUNITY):(.*)$", re.MULTILINE)
 
 
 def _parse_gemini(analysis_text: str) -> tuple[str, str, bool]:
     """Extract signal_type, urgency, and arb_opportunity from Gemini output."""
-    signal_type    = "STABLE"
-    urgency        = "LOW"
-    arb_opportunity = False
-
-    for line in analysis_text.split("\n"):
-        if "SIGNAL_TYPE:" in line:
-            signal_type = line.split(":", 1)[1].strip()
-        elif "URGENCY:" in line:
-            urgency = line.split(":", 1)[1].strip()
-        elif "ARB_OPPORTUNITY:" in line:
-            arb_opportunity = "YES" in line
+    parsed = dict(_GEMINI_FIELD_RE.findall(analysis_text))
+
+    signal_type     = parsed.get("SIGNAL_TYPE", "STABLE").strip()
+    urgency         = parsed.get("URGENCY", "LOW").strip()
+    arb_opportunity = "YES" in parsed.get("ARB_OPPORTUNITY", "")
 
     return signal_type, urgency, arb_opportunity
 
 
+# Scoring tables indexed by the enum values above.
+_URGENCY_POINTS:    tuple[int, ...] = (0, 10, 20)
+_RISK_ADJUSTMENTS:  tuple[int, ...] = (5, 0, -10)
+_PHASE_ADJUSTMENTS: tuple[int, ...] = (0, 20, 15, -25, 10)
+
+
 def _compute_confidence(
     signal:          float,
     price_diff:      float,
-    urgency:         str,
+    urgency:         Urgency,
     arb_opportunity: bool,
-    phase:           str,
-    risk_level:      str,
+    phase:           MarketPhase,
+    risk_level:      RiskLevel,
 ) -> int:
     base = int(
         (abs(signal) * 40)
         + (price_diff * 1000)
-        + (20 if urgency == "HIGH" else 10 if urgency == "MEDIUM" else 0)
+        + _URGENCY_POINTS[urgency]
         + (10 if arb_opportunity else 0)
     )
 
-    phase_adjustments = {
-        "MOMENTUM_BUILDING":        20,
-        "ACCUMULATION_PHASE":       15,
-        "DISTRIBUTION_PHASE":      -25,
-        "VOLATILITY_SPIKE_INCOMING": 10,
-    }
-    risk_adjustments = {"HIGH": -10, "LOW": 5}
-
-    adjusted = base + phase_adjustments.get(phase, 0) + risk_adjustments.get(risk_level, 0)
+    adjusted = base + _PHASE_ADJUSTMENTS[phase] + _RISK_ADJUSTMENTS[risk_level]
     return max(0, min(100, adjusted))
 
 
-def _determine_action(arb_confirmed: bool, confidence: int, signal: float, risk_level: str) -> str:
-    if risk_level == "HIGH" and confidence < 60:
-        return "HOLD"
-    if not arb_confirmed or confidence < 20:
-        return "HOLD"
-    if confidence >= 60:
-        return "EXECUTE_TRADE"
-    if confidence >= 30:
-        return "PAPER_TRADE"
-    return "MONITOR"
+# Confidence buckets: <20, 20-29, 30-59, >=60.
+_CONFIDENCE_BUCKETS = (20, 30, 60)
+_BUCKET_ACTIONS     = ("HOLD", "MONITOR", "PAPER_TRADE", "EXECUTE_TRADE")
+
+# (high_risk, arb_confirmed, confidence bucket) -> action. High risk only
+# permits trading in the top bucket; without a confirmed arb, always hold.
+_ACTION_TABLE: dict[tuple[bool, bool, int], str] = {
+    (high_risk, arb_confirmed, bucket): (
+        _BUCKET_ACTIONS[bucket]
+        if arb_confirmed and not (high_risk and bucket < len(_CONFIDENCE_BUCKETS))
+        else "HOLD"
+    )
+    for high_risk in (False, True)
+    for arb_confirmed in (False, True)
+    for bucket in range(len(_BUCKET_ACTIONS))
+}
+
+
+def _determine_action(arb_confirmed: bool, confidence: int, signal: float, risk_level: RiskLevel) -> str:
+    return _ACTION_TABLE[(risk_level == RiskLevel.HIGH, bool(arb_confirmed), bisect_right(_CONFIDENCE_BUCKETS, confidence))]
+
+
+@dataclass(slots=True)
+class Decision:
+    """A single arbitrage decision; converted to a plain dict at the API boundary."""
+
+    token:                str
+    timestamp:            str
+    cex_price:            float
+    dex_price:            float
+    price_diff_pct:       float
+    direction:            str
+    sentiment_signal:     float
+    signal_type:          str
+    urgency:              str
+    market_phase:         str
+    risk_level:           str
+    arb_confirmed:        bool
+    confidence_score:     int
+    action:               str
+    intel_recommendation: str
+    reason:               str
+    execution_result:     Optional[dict] = None
+
+    def to_dict(self) -> dict:
+        data = {name: getattr(self, name) for name in _DECISION_FIELDS}
+        if data["execution_result"] is None:
+            del data["execution_result"]
+        return data
+
+
+_DECISION_FIELDS = tuple(f.name for f in fields(Decision))
+
+
+class _HistoryArchiver:
+    """Appends decisions evicted from in-memory history to a JSONL file off the hot path."""
+
+    _ARCHIVE_FILE = os.path.join(os.path.dirname(__file__), "..", "decision_history.jsonl")
+
+    def __init__(self) -> None:
+        self._queue: queue.Queue[Decision] = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def put(self, decision: Decision) -> None:
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="decision-archive", daemon=True)
+                    self._thread.start()
+        self._queue.put(decision)
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                with open(self._ARCHIVE_FILE, "ab") as fh:
+                    fh.write(b"".join(orjson.dumps(d.to_dict()) + b"\n" for d in batch))
+            except OSError:
+                logger.warning("Could not archive %d evicted decisions.", len(batch))
+
+
+_archiver = _HistoryArchiver()
 
 
 class DecisionAgent:
@@ -90,8 +355,26 @@ class DecisionAgent:
 
     def __init__(self, use_testnet: bool = False) -> None:
         self._dex_fetcher     = DEXPriceFetcher(use_testnet=use_testnet)
-        self._execution_agent = ExecutionAgent(config.mcp_server_url)
-        self.trade_history: list[dict] = []
+        self._execution_agent = ExecutionAgent.shared(config.mcp_server_url)
+        # Bounded in-memory history; the oldest records are archived to disk as they fall off.
+        self.trade_history: deque[Decision] = deque(maxlen=config.decision_history_cap)
+        # token -> (tick, monotonic time, cex price, dex price) of the last quiet fetch.
+        self._quiet_prices: dict[str, tuple[int, float, float, float]] = {}
+        self._tick = 0
+        # Block number read once per tick; DEX prices are cached against it.
+        self._tick_block: Optional[int] = None
+
+    def start_tick(self) -> None:
+        """Begin a polling cycle: drop CEX prices and read the block number once for every DEX lookup."""
+        clear_cex_cache()
+        self._tick      += 1
+        self._tick_block = self._dex_fetcher.current_block()
+
+    def clear_price_cache(self) -> None:
+        """Drop cached CEX and DEX prices so the next evaluation refetches both."""
+        clear_cex_cache()
+        self._dex_fetcher.clear_cache()
+        self._quiet_prices.clear()
 
     def evaluate(self, analysis_result: dict, token: str) -> dict:
         """Backwards-compatible wrapper — delegates to evaluate_with_intelligence."""
@@ -102,6 +385,7 @@ class DecisionAgent:
         analysis_result: dict,
         intel_result:    Optional[dict],
         token:           str,
+        cex_cache:       Optional[dict] = None,
     ) -> dict:
         """Produce an arbitrage decision enriched with on-chain intelligence data.
 
@@ -109,94 +393,175 @@ class DecisionAgent:
             analysis_result: Output from AnalysisAgent.run().
             intel_result:    Output from OnChainIntelligenceAgent.run(), or None.
             token:           Token symbol (e.g. 'BNB').
+            cex_cache:       Prefetched output of fetch_cex_prices() for this tick, or None.
 
         Returns:
             Decision dict with action, confidence, prices, and optional execution result.
         """
+        quiet = self._reusable_prices(analysis_result, token)
+        if quiet is not None:
+            return self._decide(analysis_result, intel_result, token, *quiet)
+
+        cex_data   = (cex_cache or {}).get(token)
+        cex_future = None if cex_data else _IO_POOL.submit(_cex_price, token)
+        dex_future = _IO_POOL.submit(self._dex_fetcher.get_dex_price, token, self._tick_block)
+
+        if cex_future is not None:
+            cex_data = _await_price(cex_future, {"price": 0.0, "change_24h": 0.0}, "CEX", token)
+        dex_price = _await_price(dex_future, 0.0, "DEX", token)
+
+        self._note_prices(token, cex_data["price"], dex_price)
+        return self._decide(analysis_result, intel_result, token, cex_data["price"], dex_price)
+
+    async def evaluate_async(
+        self,
+        analysis_result: dict,
+        intel_result:    Optional[dict],
+        token:           str,
+        cex_cache:       Optional[dict] = None,
+        session:         Optional[aiohttp.ClientSession] = None,
+    ) -> dict:
+        """Async variant of evaluate_with_intelligence for event-loop schedulers.
+
+        The CEX lookup goes through *session* when one is given, otherwise it
+        falls back to the blocking fetch on the shared I/O pool. The web3-backed
+        DEX lookup always runs on the pool. To score many tokens, prefetch with
+        fetch_cex_prices_async() and asyncio.gather() the evaluations.
+        """
+        quiet = self._reusable_prices(analysis_result, token)
+        if quiet is not None:
+            return self._decide(analysis_result, intel_result, token, *quiet)
+
+        loop     = asyncio.get_running_loop()
+        cex_data = (cex_cache or {}).get(token)
+        dex_task = loop.run_in_executor(_IO_POOL, self._dex_fetcher.get_dex_price, token, self._tick_block)
+
+        if not cex_data:
+            if session is not None:
+                prices   = await _await_price_async(fetch_cex_prices_async([token], session), {}, "CEX", token)
+                cex_data = prices.get(token)
+            else:
+                cex_future = loop.run_in_executor(_IO_POOL, _cex_price, token)
+                cex_data   = await _await_price_async(cex_future, None, "CEX", token)
+            cex_data = cex_data or {"price": 0.0, "change_24h": 0.0}
+        dex_price = await _await_price_async(dex_task, 0.0, "DEX", token)
+
+        self._note_prices(token, cex_data["price"], dex_price)
+        return self._decide(analysis_result, intel_result, token, cex_data["price"], dex_price)
+
+    def _reusable_prices(self, analysis_result: dict, token: str) -> Optional[tuple[float, float]]:
+        """Return this or the previous tick's quiet prices for *token* when the analysis carries no signal."""
+        if analysis_result.get("final_signal", 0.0) or analysis_result.get("gemini_analysis"):
+            return None
+        noted = self._quiet_prices.get(token)
+        if noted is None or self._tick - noted[0] > 1 or time.monotonic() - noted[1] > _QUIET_MAX_AGE_SECONDS:
+            return None
+        return noted[2], noted[3]
+
+    def _note_prices(self, token: str, cex_price: float, dex_price: float) -> None:
+        if cex_price > 0 and dex_price > 0 and abs(cex_price - dex_price) / cex_price <= _QUIET_MAX_PRICE_DIFF:
+            self._quiet_prices[token] = (self._tick, time.monotonic(), cex_price, dex_price)
+        else:
+            self._quiet_prices.pop(token, None)
+
+    def _decide(
+        self,
+        analysis_result: dict,
+        intel_result:    Optional[dict],
+        token:           str,
+        cex_price:       float,
+        dex_price:       float,
+    ) -> dict:
         final_signal = analysis_result.get("final_signal", 0.0)
-        signal_type, urgency, arb_opportunity = _parse_gemini(
+        signal_type, urgency_label, arb_opportunity = _parse_gemini(
             analysis_result.get("gemini_analysis", "")
         )
 
-        cex_data  = _cex_price(token)
-        cex_price = cex_data["price"]
-        dex_price = self._dex_fetcher.get_dex_price(token)
-
         price_diff = 0.0
         direction  = "NONE"
         if cex_price > 0 and dex_price > 0:
             price_diff = abs(cex_price - dex_price) / cex_price
             direction  = "BUY_DEX_SELL_CEX" if dex_price < cex_price else "BUY_CEX_SELL_DEX"
 
-        phase              = "UNKNOWN"
-        risk_level         = "MEDIUM"
+        phase_label          = "UNKNOWN"
+        risk_label           = "MEDIUM"
         intel_recommendation = ""
 
         if intel_result:
-            pred               = intel_result.get("prediction", {})
-            phase              = pred.get("predicted_phase", "UNKNOWN")
-            risk_level         = pred.get("risk_level", "MEDIUM")
+            pred                 = intel_result.get("prediction", {})
+            phase_label          = pred.get("predicted_phase", "UNKNOWN")
+            risk_label           = pred.get("risk_level", "MEDIUM")
             intel_recommendation = pred.get("recommendation", "")
 
-        confidence = _compute_confidence(final_signal, price_diff, urgency, arb_opportunity, phase, risk_level)
+        # The enums only drive scoring; the decision reports the labels as received.
+        urgency    = _enum_member(Urgency, urgency_label, Urgency.LOW)
+        phase      = _enum_member(MarketPhase, phase_label, MarketPhase.UNKNOWN)
+        risk_level = _enum_member(RiskLevel, risk_label, RiskLevel.MEDIUM)
+
+        abs_signal = math.fabs(final_signal)
+        confidence = _compute_confidence(abs_signal, price_diff, urgency, arb_opportunity, phase, risk_level)
 
-        sentiment_trigger = abs(final_signal) > config.sentiment_threshold
-        price_trigger     = price_diff > config.price_diff_threshold
+        # price_diff is only non-zero when both prices are positive, so a large
+        # diff already implies a live DEX price. Cheapest predicates go first.
+        big_diff = price_diff > 0.005
 
         arb_confirmed = (
-            (sentiment_trigger and price_trigger)
+            big_diff
+            or (abs_signal > config.sentiment_threshold and price_diff > config.price_diff_threshold)
             or (arb_opportunity and confidence > 30)
-            or (price_diff > 0.005 and dex_price > 0)
-            or (phase == "MOMENTUM_BUILDING" and price_diff > 0.003)
+            or (phase == MarketPhase.MOMENTUM_BUILDING and price_diff > 0.003)
         )
 
         action = _determine_action(arb_confirmed, confidence, final_signal, risk_level)
 
-        decision = {
-            "token":               token,
-            "timestamp":           datetime.utcnow().isoformat(),
-            "cex_price":           cex_price,
-            "dex_price":           dex_price,
-            "price_diff_pct":      round(price_diff * 100, 3),
-            "direction":           direction,
-            "sentiment_signal":    final_signal,
-            "signal_type":         signal_type,
-            "urgency":             urgency,
-            "market_phase":        phase,
-            "risk_level":          risk_level,
-            "arb_confirmed":       arb_confirmed,
-            "confidence_score":    confidence,
-            "action":              action,
-            "intel_recommendation": intel_recommendation,
-            "reason":              (
+        decision = Decision(
+            token                = token,
+            timestamp            = _now_iso(),
+            cex_price            = cex_price,
+            dex_price            = dex_price,
+            price_diff_pct       = round(price_diff * 100, 3),
+            direction            = direction,
+            sentiment_signal     = final_signal,
+            signal_type          = signal_type,
+            urgency              = urgency_label,
+            market_phase         = phase_label,
+            risk_level           = risk_label,
+            arb_confirmed        = arb_confirmed,
+            confidence_score     = confidence,
+            action               = action,
+            intel_recommendation = intel_recommendation,
+            reason               = (
                 f"Sentiment={final_signal:.3f} | "
                 f"PriceDiff={price_diff * 100:.2f}% | "
-                f"Phase={phase} | Risk={risk_level}"
+                f"Phase={phase_label} | Risk={risk_label}"
             ),
-        }
+        )
 
+        if len(self.trade_history) == self.trade_history.maxlen:
+            _archiver.put(self.trade_history[0])
         self.trade_history.append(decision)
         self._log_decision(decision)
 
         if action == "EXECUTE_TRADE":
             if config.execution_enabled:
                 logger.info("EXECUTE_TRADE triggered — routing to ExecutionAgent.")
-                decision["execution_result"] = self._execution_agent.execute(decision)
+                decision.execution_result = self._execution_agent.execute(decision.to_dict())
             else:
                 logger.info("EXECUTE_TRADE triggered but execution is disabled.")
-                decision["execution_result"] = {"status": "DISABLED"}
+                decision.execution_result = {"status": "DISABLED"}
 
-        return decision
+        return decision.to_dict()
 
-    def _log_decision(self, decision: dict) -> None:
-        action = decision["action"]
+    def _log_decision(self, decision: Decision) -> None:
+        if not logger.isEnabledFor(logging.INFO):
+            return
         logger.info(
             "[%s] CEX=%.4f DEX=%.4f diff=%.3f%% signal=%+.3f confidence=%d/100 -> %s",
-            decision["token"],
-            decision["cex_price"],
-            decision["dex_price"],
-            decision["price_diff_pct"],
-            decision["sentiment_signal"],
-            decision["confidence_score"],
-            action,
-        )
\ No newline at end of file
+            decision.token,
+            decision.cex_price,
+            decision.dex_price,
+            decision.price_diff_pct,
+            decision.sentiment_signal,
+            decision.confidence_score,
+            decision.action,
+        )
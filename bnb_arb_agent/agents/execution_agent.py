@@ -1,25 +1,51 @@
 """Trade execution agent — routes swap orders through the bnbchain-mcp server."""
 
 import asyncio
+import atexit
+import contextlib
+import functools
 import json
+import logging
 import os
-import re
+import queue
+import random
+import shutil
+import threading
 import time
-from datetime import datetime, timedelta
+from collections import deque
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from enum import Enum
+from itertools import islice
 from typing import Optional
 from dotenv import load_dotenv
 
 load_dotenv()
 
+import anyio
+from anyio.from_thread import BlockingPortal, start_blocking_portal
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+
+try:
+    from mcp import ClientSession
+    from mcp.client.sse import sse_client
+    from mcp.shared.exceptions import McpError
+except ImportError:  # decision-only setups can run without the MCP SDK
+    ClientSession = sse_client = None
+
+    class McpError(Exception):
+        """Stand-in so the except clauses below still work without the SDK."""
 
 from core.constants import (
     BSC_TESTNET_CHAIN_ID,
     BSC_TESTNET_RPC,
     PANCAKE_V2_ROUTER_TESTNET,
     ROUTER_ABI,
-    ROUTER_ABI_JSON,
-    SWAP_ABI_JSON,
+    SWAP_EXACT_TOKENS_FOR_TOKENS_ABI,
     TESTNET_TOKENS,
 )
 from core.logger import get_logger
@@ -29,7 +55,61 @@ from agents.auditor import audit_token  # If auditor.py is in the root, change t
 
 logger = get_logger(__name__)
 
-_TX_HASH_PATTERN = re.compile(r"(0x[a-fA-F0-9]{64})")
+def _tail_lines(path: str, count: int, block_size: int = 64 * 1024) -> list[bytes]:
+    """Last *count* lines of *path*, read backwards so startup cost doesn't grow with the file."""
+    with open(path, "rb") as fh:
+        end = fh.seek(0, os.SEEK_END)
+        data = b""
+        while end > 0 and data.count(b"\n") <= count:
+            start = max(0, end - block_size)
+            fh.seek(start)
+            data = fh.read(end - start) + data
+            end = start
+    lines = data.splitlines()
+    if end > 0:
+        lines = lines[1:]  # first line may be cut off mid-record
+    return lines[-count:]
+
+
+def _iso_from_ns(timestamp_ns: int) -> str:
+    """Naive-UTC ISO string for a ``time.time_ns()`` value (the trade log's historical format)."""
+    return datetime.fromtimestamp(timestamp_ns / 1e9, timezone.utc).replace(tzinfo=None).isoformat()
+
+
+_HEX_DIGITS = frozenset("0123456789abcdefABCDEF")
+
+
+def _find_tx_hash(text: str) -> Optional[str]:
+    """Return the first ``0x`` + 64 hex digit run in *text*, or None."""
+    # str.find is a C substring scan; most MCP texts carry no "0x" at all.
+    idx = text.find("0x")
+    while idx != -1:
+        digits = text[idx + 2:idx + 66]
+        if len(digits) == 64 and _HEX_DIGITS.issuperset(digits):
+            return text[idx:idx + 66]
+        idx = text.find("0x", idx + 1)
+    return None
+
+
+_TX_HASH_KEYS = ("transactionHash", "txHash", "tx_hash", "hash", "transaction_hash")
+
+
+def _search_tx_hash(value) -> Optional[str]:
+    """Depth-first search of a parsed MCP result, preferring the usual hash keys."""
+    if isinstance(value, str):
+        return _find_tx_hash(value)
+    if isinstance(value, dict):
+        for key in _TX_HASH_KEYS:
+            if key in value and (match := _search_tx_hash(value[key])):
+                return match
+        value = value.values()
+    elif not isinstance(value, list):
+        return None
+    for item in value:
+        if match := _search_tx_hash(item):
+            return match
+    return None
+
 
 ERC20_APPROVE_ABI = [
     {
@@ -44,6 +124,19 @@ ERC20_APPROVE_ABI = [
     }
 ]
 
+ERC20_ALLOWANCE_ABI = [
+    {
+        "inputs": [
+            {"internalType": "address", "name": "owner", "type": "address"},
+            {"internalType": "address", "name": "spender", "type": "address"},
+        ],
+        "name": "allowance",
+        "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
+        "stateMutability": "view",
+        "type": "function",
+    }
+]
+
 SWAP_EXACT_ETH_FOR_TOKENS_ABI = [
     {
         "inputs": [
@@ -67,41 +160,330 @@ MAINNET_AUDIT_MAP = {
     "SAFEMOON": "0x8076C74C5e3F5852037F31Ff0093Eeb8c8ADd8D3", # Malicious!
 }
 
+_WEI_MULT = 10 ** 18
+
+
+@functools.lru_cache(maxsize=32)
+def _swap_path(token: str, buy: bool) -> tuple[str, ...]:
+    """Router path for *token* (upper-cased); empty when the token cannot be swapped."""
+    wbnb = TESTNET_TOKENS["BNB"].lower()
+    busd = TESTNET_TOKENS["BUSD"].lower()
+    token_addr = TESTNET_TOKENS.get(token)
+    if not token_addr:
+        return ()
+    token_addr = token_addr.lower()
+    if buy:
+        if token_addr == wbnb:
+            return ()
+        if token_addr == busd:
+            return (wbnb, busd)
+        return (wbnb, busd, token_addr)
+    if token_addr == busd:
+        return (busd, wbnb)
+    return (token_addr, busd, wbnb)
+
+
+@functools.lru_cache(maxsize=32)
+def _swap_pair(token: str, direction: str) -> tuple[str, str]:
+    stable = TESTNET_TOKENS.get("BUSD", TESTNET_TOKENS["BNB"])
+    token_addr = TESTNET_TOKENS.get(token, TESTNET_TOKENS["BNB"])
+    if direction == "BUY_DEX_SELL_CEX": return stable, token_addr
+    return token_addr, stable
+
+
+@functools.lru_cache(maxsize=64)
+def _checksum(address: str) -> str:
+    """EIP-55 form of *address*; each conversion costs a keccak256, so cache it."""
+    from web3 import Web3
+    return Web3.to_checksum_address(address)
+
+
+# Static parts of the MCP contract-call payloads; call sites add "args"
+# (and "contractAddress" for approvals) on top of these.
+_QUOTE_CALL = {
+    "contractAddress": PANCAKE_V2_ROUTER_TESTNET,
+    "abi": ROUTER_ABI,
+    "functionName": "getAmountsOut",
+    "network": "bsc-testnet",
+}
+_SWAP_CALL = {
+    "contractAddress": PANCAKE_V2_ROUTER_TESTNET,
+    "abi": SWAP_EXACT_TOKENS_FOR_TOKENS_ABI,
+    "functionName": "swapExactTokensForTokens",
+    "network": "bsc-testnet",
+}
+_APPROVE_CALL = {
+    "abi": ERC20_APPROVE_ABI,
+    "functionName": "approve",
+    "network": "bsc-testnet",
+}
+_ALLOWANCE_CALL = {
+    "abi": ERC20_ALLOWANCE_ABI,
+    "functionName": "allowance",
+    "network": "bsc-testnet",
+}
+_MAX_UINT256 = 2 ** 256 - 1
+
+@functools.lru_cache(maxsize=32)
+def _trade_labels(token: str, direction: str) -> tuple[str, str]:
+    """(token_in, token_out) labels reported on a trade result."""
+    return (token, "BUSD") if direction == "BUY_CEX_SELL_DEX" else ("BUSD", token)
+
+
+_JSON_START = frozenset('{["-0123456789tfn')
+
+
+def _looks_like_error(text: str, phrase: str = "") -> bool:
+    """True when tool text reads as a failure: mentions "failed", starts with
+    "error", or contains *phrase*."""
+    lowered = text.lower()
+    if "failed" in lowered:
+        return True
+    # Most payloads never say "error", so the strip/prefix check rarely runs.
+    if "error" not in lowered:
+        return False
+    return lowered.lstrip().startswith("error") or bool(phrase and phrase in lowered)
+
+_RETRYABLE_ERRORS = frozenset({"timeout", "transport"})
+_READ_ATTEMPTS = 3
+
+
+def _backoff_delay(attempt: int) -> float:
+    """Capped exponential backoff with a little jitter so retries don't line up."""
+    return min(1.0, 0.1 * 2 ** attempt) + random.random() * 0.05
+
+# Reads repeated within these windows are served from cache: quotes for
+# about one BSC block, balances a little longer.
+_READ_TTL_SECONDS = {"read_contract": 2.0, "get_native_balance": 5.0}
+# Tools that are safe to resend after the session drops mid-call. A write
+# may already have reached the server, so resending could submit it twice.
+_RESENDABLE_TOOLS = frozenset({"read_contract", "get_native_balance", "estimate_gas"})
+# Right after a failed trade the MCP server is almost certainly still
+# degraded; new trades in this window are skipped without counting against
+# the breaker.
+_RECENT_FAILURE_SECONDS = 0.5
+_RECENT_FAILURE_REASON  = "A trade failed moments ago; skipping while MCP recovers."
+# A balance read that fails in transit may lean on a successful one this recent.
+_STALE_BALANCE_SECONDS = 30.0
+# Two-leg gas estimates move with the gas price, which changes slowly.
+_GAS_TTL_SECONDS = 30.0
+
+# A refused connect or a gateway 5xx while the MCP server restarts gets two
+# quick retries, so a blip doesn't fail pre-flight and count against the breaker.
+_PROBE_RETRY   = Retry(total=2, connect=2, read=0, backoff_factor=0.1, status_forcelist=(502, 503, 504), allowed_methods=("GET",))
+_PROBE_ADAPTER = HTTPAdapter(pool_connections=4, pool_maxsize=4, max_retries=_PROBE_RETRY)
+_PROBE_SESSION = requests.Session()
+_PROBE_SESSION.mount("http://", _PROBE_ADAPTER)
+_PROBE_SESSION.mount("https://", _PROBE_ADAPTER)
+atexit.register(_PROBE_SESSION.close)
+
+_portal_lock = threading.Lock()
+_portal: Optional[BlockingPortal] = None
+_portal_cm = None
+
+
+def _get_portal() -> BlockingPortal:
+    """Return the process-wide portal whose event loop owns every MCP session, starting it on first use."""
+    global _portal, _portal_cm
+    with _portal_lock:
+        if _portal is None:
+            _portal_cm = start_blocking_portal(backend="asyncio")
+            _portal = _portal_cm.__enter__()
+    return _portal
+
+
+def _stop_portal() -> None:
+    global _portal, _portal_cm
+    with _portal_lock:
+        if _portal is None:
+            return
+        cm, _portal, _portal_cm = _portal_cm, None, None
+    cm.__exit__(None, None, None)
+
+
+# Registered before any client so atexit (LIFO) closes sessions first.
+atexit.register(_stop_portal)
+
+
 class MCPClient:
-    """Async MCP client over SSE (HTTP) transport."""
+    """MCP client over SSE (HTTP) transport.
+
+    One SSE stream and initialised ClientSession are kept open per server and
+    reused across tool calls. The session lives in a runner task on the event
+    loop of a shared anyio BlockingPortal; sync callers submit coroutines
+    through the portal.
+    """
+
+    _CALL_TIMEOUT_SECONDS = 120
+    _ALIVE_TTL_SECONDS    = 5.0
+    _RECONNECT_ERRORS = (ConnectionError, anyio.ClosedResourceError, anyio.BrokenResourceError, anyio.EndOfStream)
+
+    _instances: dict[str, "MCPClient"] = {}
+    _instances_lock = threading.Lock()
+
     def __init__(self, base_url: str = "http://localhost:3001") -> None:
         normalized = base_url.rstrip("/")
         self._sse_url = normalized if normalized.endswith("/sse") else f"{normalized}/sse"
+        self._session = None
+        self._runner: Optional[asyncio.Task] = None
+        self._closed: Optional[asyncio.Event] = None
+        self._session_lock: Optional[asyncio.Lock] = None
+        self._alive_until = 0.0
+
+    @classmethod
+    def shared(cls, base_url: str = "http://localhost:3001") -> "MCPClient":
+        """Return the process-wide client for *base_url* so its session is reused."""
+        with cls._instances_lock:
+            client = cls._instances.get(base_url)
+            if client is None:
+                client = cls._instances[base_url] = cls(base_url)
+                atexit.register(client.close)
+            return client
 
     def is_alive(self) -> bool:
+        # An open session already proves the server is reachable.
+        runner = self._runner
+        if runner is not None and not runner.done():
+            return True
+        if time.monotonic() < self._alive_until:
+            return True
         try:
-            response = requests.get(self._sse_url, timeout=5, stream=True)
-            return response.status_code == 200
+            # /sse never ends, so close the stream as soon as headers arrive.
+            with _PROBE_SESSION.get(self._sse_url, timeout=5, stream=True) as response:
+                alive = response.status_code == 200
         except requests.RequestException:
             return False
+        if alive:
+            self._alive_until = time.monotonic() + self._ALIVE_TTL_SECONDS
+        return alive
 
     def call_tool(self, tool_name: str, arguments: dict) -> dict:
-        """Invoke an MCP tool and return the response dict."""
-        return asyncio.run(self._call_tool_async(tool_name, arguments))
+        """Invoke an MCP tool and return the response dict.
 
-    async def _call_tool_async(self, tool_name: str, arguments: dict) -> dict:
+        Failures come back as ``{"error": msg, "error_type": ...}`` where
+        error_type is "timeout", "transport" (connection / protocol failure)
+        or "rpc" (the tool ran and reported an error).
+        """
+        try:
+            return self.run(self.acall_tool(tool_name, arguments))
+        except FutureTimeoutError:
+            return self._timeout_error(tool_name)
+
+    async def acall_tool(self, tool_name: str, arguments: dict) -> dict:
+        """Coroutine form of call_tool(); must be awaited on the MCP background loop (see run())."""
+        # asyncio.wait reports a timeout through the pending set instead of
+        # raising, so the expected slow-server case builds no traceback.
+        task = asyncio.ensure_future(self._call_tool_async(tool_name, arguments))
+        done, _ = await asyncio.wait((task,), timeout=self._CALL_TIMEOUT_SECONDS)
+        if not done:
+            task.cancel()
+            return self._timeout_error(tool_name)
+        result = task.result()
+        if result.get("error_type") != "transport":
+            # The server answered, which is as good as a liveness probe.
+            self._alive_until = time.monotonic() + self._ALIVE_TTL_SECONDS
+        return result
+
+    def _timeout_error(self, tool_name: str) -> dict:
+        return {"error": f"MCP call {tool_name} timed out after {self._CALL_TIMEOUT_SECONDS}s.", "error_type": "timeout"}
+
+    def run(self, coro, timeout: Optional[float] = _CALL_TIMEOUT_SECONDS):
+        """Run *coro* on the MCP background loop and block until it finishes.
+
+        Pass ``timeout=None`` for multi-call coroutines; each acall_tool()
+        inside them is already bounded.
+        """
+        future = _get_portal().start_task_soon(lambda: coro)
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise
+
+    def close(self) -> None:
+        """Close the persistent session, if one is open."""
+        portal = _portal
+        if self._runner is None or portal is None:
+            return
         try:
-            from mcp import ClientSession
-            from mcp.client.sse import sse_client
+            portal.start_task_soon(self._reset_session).result(timeout=5)
+        except Exception:
+            logger.debug("MCP session did not close cleanly.")
 
-            # Connect to the running server over HTTP (No more Windows pipes!)
+    async def _run_session(self, ready: asyncio.Future) -> None:
+        # sse_client and ClientSession are anyio task-group contexts, so they
+        # must be entered and exited by the same task: this one.
+        try:
+            if sse_client is None:
+                raise RuntimeError("The mcp package is not installed; run `pip install mcp`.")
             async with sse_client(self._sse_url) as (read, write):
                 async with ClientSession(read, write) as session:
                     await session.initialize()
-                    result = await session.call_tool(tool_name, arguments)
-                    content = result.content
-                    if content and hasattr(content[0], "text"):
-                        parsed = self._try_parse_json(content[0].text)
-                        extracted_error = self._extract_embedded_error(parsed)
-                        if extracted_error:
-                            return {"error": extracted_error, "content": [c.model_dump() for c in content]}
-                        return {"result": parsed, "content": [c.model_dump() for c in content]}
-                    return {"result": str(content)}
+                    self._session = session
+                    ready.set_result(session)
+                    await self._closed.wait()
+        except BaseException as exc:
+            if not ready.done():
+                ready.set_exception(exc)
+            elif not isinstance(exc, asyncio.CancelledError):
+                logger.warning("MCP session dropped: %s", exc)
+        finally:
+            self._session = None
+
+    async def _ensure_session(self):
+        if self._session_lock is None:
+            self._session_lock = asyncio.Lock()
+        async with self._session_lock:
+            if self._session is not None and self._runner is not None and not self._runner.done():
+                return self._session
+            ready         = asyncio.get_running_loop().create_future()
+            self._closed  = asyncio.Event()
+            self._runner  = asyncio.create_task(self._run_session(ready))
+            return await ready
+
+    async def _reset_session(self, failed: Optional[asyncio.Task] = None) -> None:
+        # With concurrent calls, only the first caller to see a dead session
+        # tears it down; later ones must not close the replacement.
+        if failed is not None and failed is not self._runner:
+            return
+        runner, self._runner = self._runner, None
+        if runner is None:
+            return
+        self._closed.set()
+        try:
+            await asyncio.wait_for(runner, timeout=5)
+        except BaseException:
+            runner.cancel()
+
+    async def _call_tool_async(self, tool_name: str, arguments: dict) -> dict:
+        runner = self._runner
+        sent   = False
+        try:
+            try:
+                session = await self._ensure_session()
+                runner  = self._runner
+                sent    = True
+                result  = await session.call_tool(tool_name, arguments)
+            except self._RECONNECT_ERRORS:
+                await self._reset_session(runner)
+                if sent and tool_name not in _RESENDABLE_TOOLS:
+                    logger.error("MCP session dropped during %s — not resending; check the wallet before retrying.", tool_name)
+                    return {"error": f"MCP session dropped during {tool_name}; outcome unknown, not resent.", "error_type": "transport"}
+                logger.info("MCP session closed — reconnecting.")
+                session = await self._ensure_session()
+                result  = await session.call_tool(tool_name, arguments)
+
+            content = result.content
+            if content and hasattr(content[0], "text"):
+                parsed = self._try_parse_json(content[0].text)
+                extracted_error = self._extract_embedded_error(parsed)
+                if extracted_error:
+                    return {"error": extracted_error, "error_type": "rpc", "content": [c.model_dump() for c in content]}
+                return {"result": parsed, "content": [c.model_dump() for c in content]}
+            return {"result": str(content)}
+        except McpError as exc:
+            # A JSON-RPC error response: the server is up and rejected the call.
+            return {"error": str(exc), "error_type": "rpc"}
         except Exception as exc:
             if hasattr(exc, 'exceptions'):
                 nested = []
@@ -110,123 +492,503 @@ class MCPClient:
                     if hasattr(sub_exc, "exceptions"):
                         nested.extend(str(inner) for inner in sub_exc.exceptions)
                 error_msgs = " | ".join(nested) if nested else str(exc)
-                return {"error": f"Server Rejected: {error_msgs}"}
-            return {"error": str(exc)}
+                return {"error": f"Server Rejected: {error_msgs}", "error_type": "transport"}
+            return {"error": str(exc), "error_type": "transport"}
 
     @staticmethod
     def _try_parse_json(value: str):
+        # Plain-text tool output ("Error: ...") can't be JSON; skip the raise.
+        if not value or value.lstrip()[:1] not in _JSON_START:
+            return value
+        # stdlib json, not orjson: wei amounts and allowances overflow 64 bits
+        # and orjson would turn them into rounded floats.
         try:
             return json.loads(value)
-        except Exception:
+        except json.JSONDecodeError:
             return value
 
     @staticmethod
     def _extract_embedded_error(value) -> str | None:
         if isinstance(value, str):
-            lowered = value.strip().lower()
-            if lowered.startswith("error") or "error writing to contract" in lowered or "failed" in lowered:
-                return value
-            return None
+            return value if _looks_like_error(value, "error writing to contract") else None
         if isinstance(value, dict):
             for key in ("error", "message"):
-                if key in value and isinstance(value[key], str):
-                    lowered = value[key].strip().lower()
-                    if lowered.startswith("error") or "failed" in lowered:
-                        return value[key]
+                text = value.get(key)
+                if text and isinstance(text, str) and _looks_like_error(text):
+                    return text
         return None
 
+class BreakerState(Enum):
+    CLOSED    = "CLOSED"
+    OPEN      = "OPEN"
+    HALF_OPEN = "HALF_OPEN"
+
+
 class CircuitBreaker:
-    # (Your existing CircuitBreaker code remains completely unchanged)
+    """CLOSED → OPEN after ``max_failures``; after the cooldown one probe trade
+    runs in HALF_OPEN and decides whether to close again or re-open.
+
+    Each consecutive trip without a successful probe doubles the open window
+    (up to ``_MAX_BACKOFF`` cooldowns), plus a little jitter so several agents
+    sharing one MCP server don't all probe at the same moment.
+
+    A probe that ends without recording success or failure (e.g. a skipped
+    trade) loses its slot after another cooldown so the breaker cannot wedge.
+
+    A successful probe closes the breaker on probation: the next failure
+    re-trips at once, until another trade succeeds. ``status`` reports this
+    as ``probation`` rather than folding it into ``consecutive_failures``.
+
+    ``status`` is rebuilt only on transitions; every trade result embeds it,
+    so callers get a shared snapshot and must not mutate it.
+    """
+
+    _MAX_BACKOFF = 8
+    _JITTER      = 0.1
+
     def __init__(self, max_failures: int = 3, cooldown_minutes: int = 15) -> None:
         self._max_failures      = max_failures
-        self._cooldown          = timedelta(minutes=cooldown_minutes)
+        self._cooldown          = cooldown_minutes * 60.0
+        self._open_for          = self._cooldown
+        self._trips             = 0
+        self._last_failure_at   = float("-inf")
         self._failures          = 0
-        self._is_open           = False
-        self._tripped_at: Optional[datetime] = None
+        self._probation         = False
+        self._state             = BreakerState.CLOSED
+        # Cooldowns run on the monotonic clock; the ISO string is only for status.
+        self._tripped_at        = 0.0
+        self._tripped_at_iso: Optional[str] = None
+        self._probe_started_at  = 0.0
+        self._lock              = threading.Lock()
+        self._refresh_status()
 
     def record_success(self) -> None:
-        self._failures  = 0
-        self._is_open   = False
-        self._tripped_at = None
+        with self._lock:
+            if self._state is BreakerState.HALF_OPEN:
+                logger.info("Circuit breaker probe succeeded — closing on probation.")
+                self._probation = True
+                self._trips     = 0
+            else:
+                self._probation = False
+            self._failures         = 0
+            self._state            = BreakerState.CLOSED
+            self._tripped_at_iso   = None
+            self._refresh_status()
 
     def record_failure(self) -> None:
-        self._failures += 1
-        if self._failures >= self._max_failures:
-            self._is_open   = True
-            self._tripped_at = datetime.utcnow()
-            logger.error("Circuit breaker tripped after %d failures.", self._failures)
+        with self._lock:
+            self._failures        += 1
+            self._last_failure_at  = time.monotonic()
+            if self._state is BreakerState.HALF_OPEN:
+                logger.error("Circuit breaker probe failed — re-opening.")
+                self._trip()
+            elif self._probation or self._failures >= self._max_failures:
+                logger.error("Circuit breaker tripped after %d failures.", self._failures)
+                self._trip()
+            self._refresh_status()
+
+    def _trip(self) -> None:
+        self._trips           += 1
+        backoff                = min(2 ** (self._trips - 1), self._MAX_BACKOFF)
+        self._open_for         = self._cooldown * (backoff + random.uniform(0, self._JITTER))
+        self._state            = BreakerState.OPEN
+        self._probation        = False
+        self._tripped_at       = time.monotonic()
+        self._tripped_at_iso   = _iso_from_ns(time.time_ns())
+
+    def release_probe(self) -> None:
+        """Hand back a half-open probe that ended without a verdict (e.g. no quote).
+
+        The breaker returns to its expired OPEN state, so the next allow_trade()
+        starts a new probe instead of waiting out another cooldown.
+        """
+        with self._lock:
+            if self._state is BreakerState.HALF_OPEN:
+                self._state = BreakerState.OPEN
+                self._refresh_status()
+
+    def failed_within(self, seconds: float) -> bool:
+        """True if a failure was recorded in the last *seconds*."""
+        return time.monotonic() - self._last_failure_at < seconds
 
     def allow_trade(self) -> bool:
-        if not self._is_open:
-            return True
-        if self._tripped_at and datetime.utcnow() > self._tripped_at + self._cooldown:
-            logger.info("Circuit breaker cooldown elapsed — resetting.")
-            self._is_open    = False
-            self._failures   = 0
-            self._tripped_at = None
+        with self._lock:
+            if self._state is BreakerState.CLOSED:
+                return True
+            now = time.monotonic()
+            if self._state is BreakerState.HALF_OPEN:
+                if now <= self._probe_started_at + self._cooldown:
+                    logger.warning("Circuit breaker half-open — probe trade still in flight.")
+                    return False
+                logger.info("Circuit breaker probe abandoned — allowing a new probe.")
+            elif now <= self._tripped_at + self._open_for:
+                remaining = int((self._tripped_at + self._open_for - now) / 60)
+                logger.warning("Circuit breaker open — %d min remaining in cooldown.", remaining)
+                return False
+            else:
+                logger.info("Circuit breaker cooldown elapsed — allowing one probe trade.")
+            self._state            = BreakerState.HALF_OPEN
+            self._probe_started_at = now
+            self._refresh_status()
             return True
-        remaining = int((self._tripped_at + self._cooldown - datetime.utcnow()).seconds / 60)
-        logger.warning("Circuit breaker open — %d min remaining in cooldown.", remaining)
-        return False
 
-    @property
-    def status(self) -> dict:
-        return {
-            "is_open":            self._is_open,
+    def _refresh_status(self) -> None:
+        self._status = {
+            "is_open":            self._state is BreakerState.OPEN,
+            "state":              self._state.value,
             "consecutive_failures": self._failures,
-            "tripped_at":         self._tripped_at.isoformat() if self._tripped_at else None,
+            "probation":          self._probation,
+            "tripped_at":         self._tripped_at_iso,
         }
 
+    @property
+    def status(self) -> dict:
+        return self._status
+
+
 class TradeLogger:
-    # (Your existing TradeLogger code remains completely unchanged)
-    _LOG_FILE = os.path.join(os.path.dirname(__file__), "..", "trade_log.json")
+    """Append-only JSONL trade log.
+
+    log() only records the entry in memory and queues it; a single writer
+    thread owns the file descriptor and batches serialised lines, writing
+    once ``_FLUSH_BYTES`` have accumulated or ``_FLUSH_SECONDS`` have passed,
+    so trading threads never block on disk. Only the last ``_TAIL_SIZE``
+    entries are kept in memory for recent().
+
+    Agents should use shared(), which keeps one logger (writer thread and
+    file descriptor) per log path for the whole process; a logger built
+    directly must be closed by its owner.
+    """
+
+    _LOG_FILE      = os.path.join(os.path.dirname(__file__), "..", "trade_log.jsonl")
+    _FLUSH_BYTES   = 64 * 1024
+    _FLUSH_SECONDS = 0.05
+    _SYNC_SECONDS  = 1.0
+    _TAIL_SIZE     = 500
+    _QUEUE_SIZE    = 1024
+    # Decision fields can carry numpy scalars; serialise them natively rather
+    # than through the default=str callback, which is left for stray types.
+    _DUMP_OPTIONS  = orjson.OPT_APPEND_NEWLINE | orjson.OPT_SERIALIZE_NUMPY
+    _STOP          = object()
+
+    _instances: dict[str, "TradeLogger"] = {}
+    _instances_lock = threading.Lock()
+
+    @classmethod
+    def shared(cls) -> "TradeLogger":
+        """Return the process-wide logger for the current log path."""
+        with cls._instances_lock:
+            trade_logger = cls._instances.get(cls._LOG_FILE)
+            if trade_logger is None or trade_logger._closed:
+                trade_logger = cls._instances[cls._LOG_FILE] = cls()
+                atexit.register(trade_logger.close)
+            return trade_logger
 
     def __init__(self) -> None:
-        self._records: list[dict] = []
+        self._records: deque[dict] = deque(maxlen=self._TAIL_SIZE)
+        self._queue: queue.Queue = queue.Queue(maxsize=self._QUEUE_SIZE)
+        self._closed = False
+        self._dropped = 0
+        self._migrate_legacy_log()
         self._load()
+        try:
+            self._fd: Optional[int] = os.open(self._LOG_FILE, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        except OSError:
+            logger.warning("Could not open trade log for writing.")
+            self._fd = None
+        self._writer = threading.Thread(target=self._drain, name="trade-log-writer", daemon=True)
+        self._writer.start()
+
+    def _migrate_legacy_log(self) -> None:
+        """Fold a pre-JSONL ``trade_log.json`` array into the JSONL log, once.
+
+        The legacy entries go ahead of anything already in the JSONL file, and
+        the old file is renamed to ``*.migrated`` so later starts skip it.
+        """
+        legacy = os.path.splitext(self._LOG_FILE)[0] + ".json"
+        if not os.path.exists(legacy):
+            return
+        try:
+            with open(legacy, "rb") as fh:
+                records = json.load(fh)
+        except (OSError, ValueError):
+            logger.warning("Could not read legacy trade log %s — leaving it in place.", legacy)
+            return
+        if isinstance(records, dict):
+            records = [records]
+        if not isinstance(records, list):
+            logger.warning("Legacy trade log %s is not a list of entries — leaving it in place.", legacy)
+            return
+        data = b"".join(self._serialise(r) for r in records if isinstance(r, dict))
+        tmp  = self._LOG_FILE + ".tmp"
+        try:
+            with open(tmp, "wb") as out:
+                out.write(data)
+                if os.path.exists(self._LOG_FILE):
+                    with open(self._LOG_FILE, "rb") as current:
+                        shutil.copyfileobj(current, out)
+                out.flush()
+                os.fsync(out.fileno())
+            os.replace(tmp, self._LOG_FILE)
+            os.replace(legacy, legacy + ".migrated")
+        except OSError:
+            logger.warning("Could not migrate legacy trade log %s.", legacy)
+            with contextlib.suppress(OSError):
+                os.remove(tmp)
+            return
+        logger.info("Migrated %d entries from legacy trade log %s.", len(records), legacy)
 
     def _load(self) -> None:
         try:
             if os.path.exists(self._LOG_FILE):
-                with open(self._LOG_FILE) as fh:
-                    self._records = json.load(fh)
-        except (OSError, json.JSONDecodeError):
-            self._records = []
+                for line in _tail_lines(self._LOG_FILE, self._TAIL_SIZE):
+                    try:
+                        self._records.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        continue
+        except OSError:
+            self._records.clear()
 
     def log(self, entry: dict) -> None:
-        entry["logged_at"] = datetime.utcnow().isoformat()
+        now_ns = time.time_ns()
+        entry.setdefault("timestamp_ns", now_ns)
+        entry["logged_at"] = _iso_from_ns(now_ns)
         self._records.append(entry)
+        if not self._closed:
+            self._enqueue(entry)
+        logger.info("Trade logged: %s | status=%s | tx=%s", entry.get("direction"), entry.get("status"), entry.get("tx_hash", "N/A"))
+
+    def _enqueue(self, entry: dict) -> None:
+        while True:
+            try:
+                self._queue.put_nowait(entry)
+                return
+            except queue.Full:
+                if self._drop_oldest_entry():
+                    self._note_dropped()
+                    continue
+            # Only flush/stop sentinels are queued; give the writer a moment,
+            # then drop the new entry rather than a sentinel.
+            try:
+                self._queue.put(entry, timeout=1)
+            except queue.Full:
+                self._note_dropped()
+            return
+
+    def _note_dropped(self) -> None:
+        self._dropped += 1
+        logger.warning("Trade log queue full — dropped an unwritten entry (%d dropped so far).", self._dropped)
+
+    def _drop_oldest_entry(self) -> bool:
+        """Evict the oldest queued record, never a flush Event or the stop sentinel."""
+        with self._queue.mutex:
+            pending = self._queue.queue
+            for index, item in enumerate(pending):
+                if isinstance(item, dict):
+                    del pending[index]
+                    self._queue.unfinished_tasks -= 1
+                    self._queue.not_full.notify()
+                    return True
+        return False
+
+    def _drain(self) -> None:
+        buf        = bytearray()
+        last_write = last_sync = time.monotonic()
+        # Written but not yet synced; an idle writer still syncs it once
+        # _SYNC_SECONDS is up instead of waiting for the next entry.
+        dirty      = False
+        while True:
+            if buf:
+                timeout = max(0.0, last_write + self._FLUSH_SECONDS - time.monotonic())
+            elif dirty:
+                timeout = max(0.0, last_sync + self._SYNC_SECONDS - time.monotonic())
+            else:
+                timeout = None
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+            stop = item is self._STOP
+            try:
+                if isinstance(item, dict):
+                    buf += self._serialise(item)
+                force = stop or isinstance(item, threading.Event)
+                now   = time.monotonic()
+                if buf and (force or len(buf) >= self._FLUSH_BYTES or now - last_write >= self._FLUSH_SECONDS):
+                    self._write(buf)
+                    buf.clear()
+                    last_write = now
+                    dirty      = True
+                if dirty and (force or now - last_sync >= self._SYNC_SECONDS):
+                    self._sync()
+                    last_sync = now
+                    dirty     = False
+            except Exception:
+                # A bad batch must not end the writer thread; drop it and keep going.
+                logger.exception("Trade log writer failed — dropped %d buffered bytes.", len(buf))
+                buf.clear()
+                last_write = time.monotonic()
+            finally:
+                if isinstance(item, threading.Event):
+                    item.set()
+                if item is not None:
+                    self._queue.task_done()
+            if stop:
+                return
+
+    def _serialise(self, entry: dict) -> bytes:
+        try:
+            entry = self._with_timestamp(entry)
+            try:
+                return orjson.dumps(entry, default=str, option=self._DUMP_OPTIONS)
+            except TypeError:
+                # orjson rejects integers wider than 64 bits, which wei amounts
+                # can be; stdlib json writes them exactly.
+                return json.dumps(entry, default=str).encode() + b"\n"
+        except Exception:
+            logger.exception("Could not serialise trade log entry — skipping it.")
+            return b""
+
+    def _write(self, data: bytearray) -> None:
+        if self._fd is None:
+            return
         try:
-            with open(self._LOG_FILE, "w") as fh:
-                json.dump(self._records, fh, indent=2, default=str)
+            view = memoryview(data)
+            while view:
+                view = view[os.write(self._fd, view):]
         except OSError:
             logger.warning("Could not persist trade log.")
-        logger.info("Trade logged: %s | status=%s | tx=%s", entry.get("direction"), entry.get("status"), entry.get("tx_hash", "N/A"))
+
+    def _sync(self) -> None:
+        if self._fd is None:
+            return
+        try:
+            getattr(os, "fdatasync", os.fsync)(self._fd)
+        except OSError:
+            logger.warning("Could not sync trade log.")
+
+    def flush(self) -> None:
+        """Block until every entry queued so far has been written out."""
+        if self._writer.is_alive():
+            done = threading.Event()
+            self._queue.put(done)
+            done.wait(timeout=5)
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(self._STOP)
+        self._writer.join(timeout=5)
+        if self._fd is not None:
+            try:
+                os.close(self._fd)
+            except OSError:
+                logger.warning("Could not close trade log.")
+            self._fd = None
 
     def recent(self, count: int = 10) -> list[dict]:
-        return self._records[-count:]
+        # Walk in from the right end so the cost is O(count), not O(_TAIL_SIZE).
+        tail = [self._with_timestamp(e) for e in islice(reversed(self._records), max(0, count))]
+        tail.reverse()
+        return tail
+
+    @staticmethod
+    def _with_timestamp(entry: dict) -> dict:
+        # Entries logged without an ISO timestamp get one from timestamp_ns
+        # when they are written out or read back.
+        if "timestamp" in entry or "timestamp_ns" not in entry:
+            return entry
+        return {**entry, "timestamp": _iso_from_ns(entry["timestamp_ns"])}
+
+@dataclass(frozen=True, slots=True)
+class _ExecSettings:
+    mcp_url:          str
+    max_failures:     int
+    cooldown_minutes: int
+    wallet:           str
+    amount_bnb:       float
+    min_profit:       float
+    min_profit_bnb:   float
+    gas_estimate_bnb: float
+
+
+@functools.lru_cache(maxsize=1)
+def _exec_settings() -> _ExecSettings:
+    """Execution settings, read from the environment once per process."""
+    return _ExecSettings(
+        mcp_url          = os.getenv("MCP_SERVER_URL", "http://localhost:3001"),
+        max_failures     = int(os.getenv("CIRCUIT_BREAKER_MAX_FAILURES", "3")),
+        cooldown_minutes = int(os.getenv("CIRCUIT_BREAKER_COOLDOWN_MIN", "15")),
+        wallet           = os.getenv("WALLET_ADDRESS", ""),
+        amount_bnb       = float(os.getenv("TRADE_AMOUNT_BNB", "0.01")),
+        min_profit       = float(os.getenv("MIN_PROFIT_THRESHOLD", "0.005")),
+        min_profit_bnb   = float(os.getenv("MIN_PROFIT_BNB", "0.000002")),
+        gas_estimate_bnb = float(os.getenv("GAS_ESTIMATE_BNB", "0")),
+    )
+
 
 class ExecutionAgent:
+    _instances: dict[str, "ExecutionAgent"] = {}
+    _instances_lock = threading.Lock()
+
+    @classmethod
+    def shared(cls, mcp_url: str = None) -> "ExecutionAgent":
+        """Return the process-wide agent for *mcp_url*.
+
+        Servers that build a DecisionAgent per request get one circuit breaker,
+        trade log and set of caches instead of a fresh agent each time.
+        """
+        url = mcp_url or _exec_settings().mcp_url
+        with cls._instances_lock:
+            agent = cls._instances.get(url)
+            if agent is None:
+                agent = cls._instances[url] = cls(url)
+            return agent
+
     def __init__(self, mcp_url: str = None) -> None:
-        url = mcp_url or os.getenv("MCP_SERVER_URL", "http://localhost:3001")
-        self._mcp            = MCPClient(url)
-        self._logger         = TradeLogger()
+        settings = _exec_settings()
+        self._mcp            = MCPClient.shared(mcp_url or settings.mcp_url)
+        self._logger         = TradeLogger.shared()
         self._breaker        = CircuitBreaker(
-            max_failures    = int(os.getenv("CIRCUIT_BREAKER_MAX_FAILURES", "3")),
-            cooldown_minutes = int(os.getenv("CIRCUIT_BREAKER_COOLDOWN_MIN", "15")),
+            max_failures    = settings.max_failures,
+            cooldown_minutes = settings.cooldown_minutes,
         )
-        self._wallet         = os.getenv("WALLET_ADDRESS", "")
-        self._amount_bnb     = float(os.getenv("TRADE_AMOUNT_BNB", "0.01"))
-        self._min_profit     = float(os.getenv("MIN_PROFIT_THRESHOLD", "0.005"))
-        self._min_profit_bnb = float(os.getenv("MIN_PROFIT_BNB", "0.000002"))
-        self._gas_estimate_bnb = float(os.getenv("GAS_ESTIMATE_BNB", "0"))
+        self._wallet         = settings.wallet
+        self._amount_bnb     = settings.amount_bnb
+        self._min_profit     = settings.min_profit
+        self._min_profit_bnb = settings.min_profit_bnb
+        self._min_profit_wei = self._to_wei(self._min_profit_bnb)
+        # The trade size is fixed per agent; convert it once.
+        self._amount_wei     = self._to_wei(self._amount_bnb)
+        self._amount_wei_str = str(self._amount_wei)
+        self._gas_estimate_bnb = settings.gas_estimate_bnb
+        # Short-lived cache of successful MCP reads, cleared after every swap.
+        self._rpc_cache: dict[tuple, tuple[float, dict]] = {}
+        # Gas-estimation client and contracts, built on first use (see _gas_web3).
+        self._web3             = None
+        self._router_contract  = None
+        self._erc20_contracts: dict[str, object] = {}
+        self._gas_cache: dict[tuple, tuple[float, float]] = {}
+        self._balance_ok_at    = float("-inf")
+        self._result_template  = {"amount": self._amount_bnb, "chain_id": BSC_TESTNET_CHAIN_ID, "router": PANCAKE_V2_ROUTER_TESTNET}
 
     def execute(self, decision: dict) -> dict:
+        return self._mcp.run(self.execute_async(decision), timeout=None)
+
+    async def execute_async(self, decision: dict) -> dict:
+        """Coroutine form of execute(); runs on the MCP background loop.
+
+        Blocking work (contract audit, liveness probe) is pushed to worker
+        threads so it never stalls the shared MCP sessions.
+        """
         token      = decision.get("token", "BNB")
         direction  = decision.get("direction", "BUY_DEX_SELL_CEX")
         price_diff = decision.get("price_diff_pct", 0.0)
 
         # 1. Circuit Breaker Check
+        if self._breaker.failed_within(_RECENT_FAILURE_SECONDS):
+            return self._build_result(token, direction, "PREFLIGHT_FAILED", _RECENT_FAILURE_REASON, decision)
         if not self._breaker.allow_trade():
             return self._build_result(token, direction, "BLOCKED_CIRCUIT_BREAKER", "Circuit breaker is open.", decision)
 
@@ -235,32 +997,33 @@ class ExecutionAgent:
         audit_address = MAINNET_AUDIT_MAP.get(token.upper())
         # 
         if audit_address:
-            is_safe = audit_token(audit_address)
+            is_safe = await asyncio.to_thread(audit_token, audit_address)
             if not is_safe:
                 logger.error(f"SECURITY ALERT: {token} failed smart contract audit. Trade aborted.")
                 result = self._build_result(token, direction, "BLOCKED_MALICIOUS_CONTRACT", "AI Auditor detected honeypot/scam signatures.", decision)
                 self._logger.log(result)
+                self._breaker.release_probe()
                 return result
         else:
             print(f"🟡 Skipping audit: No mainnet address mapped for {token}.")
         print(f"🟡 Auditor temporarily disabled for testnet debugging.")
 
         # 3. Standard Preflight Checks
-        preflight = self._preflight(token, direction, price_diff)
+        preflight = await self._preflight_async(token, direction, price_diff)
         if not preflight["passed"]:
             result = self._build_result(token, direction, "PREFLIGHT_FAILED", preflight["reason"], decision)
             self._logger.log(result)
-            self._breaker.record_failure()
+            self._record_failure()
             return result
 
         # 4. Execute Buy
-        amount_wei          = self._to_wei(self._amount_bnb)
+        amount_wei          = self._amount_wei
 
-        buy = self._swap_native_for_token(token, amount_wei)
+        buy = await self._swap_native_for_token_async(token, amount_wei)
         if buy.get("error"):
             result = self._build_result(token, direction, "FAILED", f"Buy-side failed: {buy['error']}", decision)
             self._logger.log(result)
-            self._breaker.record_failure()
+            self._record_failure()
             return result
 
         # 5. Success (CEX sell leg is off-chain/manual in this demo)
@@ -284,6 +1047,8 @@ class ExecutionAgent:
         price_diff = decision.get("price_diff_pct", 0.0)
         force_trade = bool(decision.get("force_trade", False))
 
+        if self._breaker.failed_within(_RECENT_FAILURE_SECONDS):
+            return self._build_result(token, direction, "PREFLIGHT_FAILED", _RECENT_FAILURE_REASON, decision)
         if not self._breaker.allow_trade():
             return self._build_result(token, direction, "BLOCKED_CIRCUIT_BREAKER", "Circuit breaker is open.", decision)
 
@@ -291,54 +1056,59 @@ class ExecutionAgent:
         if not preflight["passed"]:
             result = self._build_result(token, direction, "PREFLIGHT_FAILED", preflight["reason"], decision)
             self._logger.log(result)
-            self._breaker.record_failure()
+            self._record_failure()
             return result
 
-        amount_wei = self._to_wei(self._amount_bnb)
+        amount_wei = self._amount_wei
         buy_path = self._buy_path(token)
         sell_path = self._sell_path(token)
         if not buy_path or not sell_path:
+            self._breaker.release_probe()
             return self._build_result(token, direction, "PREFLIGHT_FAILED", "Invalid swap path for token.", decision)
 
-        gas_estimate_bnb = self._estimate_gas_bnb(amount_wei, buy_path, sell_path) or self._gas_estimate_bnb
+        # Gas estimation (web3) and the buy quote (MCP) don't depend on each other.
+        gas_estimate_bnb, buy_quote = self._mcp.run(self._two_leg_estimates(amount_wei, buy_path, sell_path), timeout=None)
+        gas_estimate_bnb = gas_estimate_bnb or self._gas_estimate_bnb
 
-        buy_quote = self._get_amounts_out(amount_wei, buy_path)
         if not buy_quote:
+            self._breaker.release_probe()
             return self._build_result(token, direction, "PREFLIGHT_FAILED", "Unable to quote buy route.", decision)
         expected_token_out = int(buy_quote[-1])
 
         sell_quote = self._get_amounts_out(expected_token_out, sell_path)
         if not sell_quote:
+            self._breaker.release_probe()
             return self._build_result(token, direction, "PREFLIGHT_FAILED", "Unable to quote sell route.", decision)
         expected_wbnb_out = int(sell_quote[-1])
 
+        # Compare in wei so large quotes never round through a float.
         expected_profit_wei = expected_wbnb_out - amount_wei
-        expected_profit_bnb = expected_profit_wei / 1e18
-        if not force_trade and expected_profit_bnb - gas_estimate_bnb < self._min_profit_bnb:
+        if not force_trade and expected_profit_wei - self._to_wei(gas_estimate_bnb) < self._min_profit_wei:
             reason = (
-                f"Expected profit {expected_profit_bnb:.6f} WBNB below minimum "
+                f"Expected profit {expected_profit_wei / _WEI_MULT:.6f} WBNB below minimum "
                 f"{self._min_profit_bnb:.6f} WBNB after gas estimate {gas_estimate_bnb:.6f}."
             )
             result = self._build_result(token, direction, "PREFLIGHT_FAILED", reason, decision)
             self._logger.log(result)
+            self._breaker.release_probe()
             return result
 
         buy = self._swap_native_for_token(token, amount_wei)
         if buy.get("error"):
             result = self._build_result(token, direction, "FAILED", f"Buy-side failed: {buy['error']}", decision)
             self._logger.log(result)
-            self._breaker.record_failure()
+            self._record_failure()
             return result
 
         sell = self._swap_token_for_token(token, buy.get("amount_out_wei", 0))
         if sell.get("error"):
             result = self._build_result(token, direction, "FAILED", f"Sell-side failed: {sell['error']}", decision)
             self._logger.log(result)
-            self._breaker.record_failure()
+            self._record_failure()
             return result
 
         actual_profit_wei = sell.get("amount_out_wei", 0) - amount_wei
-        actual_profit_bnb = actual_profit_wei / 1e18
+        actual_profit_bnb = actual_profit_wei / _WEI_MULT
 
         result = self._build_result(
             token,
@@ -360,41 +1130,83 @@ class ExecutionAgent:
         return result
 
     # (The rest of your helper functions _preflight, _swap, _swap_pair, _to_wei, _build_result remain completely unchanged)
+    def invalidate_reads(self) -> None:
+        """Drop cached balance/quote reads so the next trade sees fresh chain state."""
+        self._rpc_cache.clear()
+
+    def _record_failure(self) -> None:
+        # A failed trade may have been driven by a stale quote; don't reuse it.
+        self.invalidate_reads()
+        self._breaker.record_failure()
+
     def _preflight(self, token: str, direction: str, price_diff: float) -> dict:
+        return self._mcp.run(self._preflight_async(token, direction, price_diff), timeout=None)
+
+    async def _preflight_async(self, token: str, direction: str, price_diff: float) -> dict:
+        # Local checks first, cheapest first: a trade that is already known to
+        # fail never pays for the liveness probe or the MCP round-trips.
+        if price_diff < self._min_profit * 100:
+            return {"passed": False, "reason": f"Profit {price_diff:.3f}% below minimum {self._min_profit * 100:.1f}%"}
         if not self._wallet:
             return {"passed": False, "reason": "WALLET_ADDRESS is missing in .env"}
-        if not self._mcp.is_alive():
-            return {"passed": False, "reason": "MCP server is not reachable."}
         if token.upper() not in TESTNET_TOKENS:
             supported = ", ".join(sorted(TESTNET_TOKENS.keys()))
             return {"passed": False, "reason": f"Unsupported token {token}. Supported: {supported}."}
         if token.upper() == "BNB":
             return {"passed": False, "reason": "Token BNB is invalid for buy-on-DEX demo. Use CAKE/BUSD/USDT/DAI."}
 
-        native_balance = self._mcp.call_tool("get_native_balance", {"address": self._wallet, "network": "bsc-testnet"})
-        if native_balance.get("error"):
-            return {"passed": False, "reason": f"Native balance check failed: {native_balance['error']}"}
-
         path = self._buy_path(token)
         if len(path) < 2:
             return {"passed": False, "reason": "Invalid swap path for token."}
-        quote = self._mcp.call_tool(
-            "read_contract",
-            {
-                "contractAddress": PANCAKE_V2_ROUTER_TESTNET,
-                "abi": json.loads(ROUTER_ABI_JSON),
-                "functionName": "getAmountsOut",
-                "args": [str(self._to_wei(self._amount_bnb)), path],
-                "network": "bsc-testnet",
-            },
-        )
+
+        if not await asyncio.to_thread(self._mcp.is_alive):
+            return {"passed": False, "reason": "MCP server is not reachable."}
+
+        # Balance and route checks are independent; run them concurrently.
+        native_balance, quote = await self._preflight_calls(path)
+        if not native_balance.get("error"):
+            self._balance_ok_at = time.monotonic()
+        elif native_balance.get("error_type") in _RETRYABLE_ERRORS and time.monotonic() - self._balance_ok_at < _STALE_BALANCE_SECONDS:
+            # A transport blip on the balance read alone shouldn't cost a trade
+            # (or a breaker strike) when the wallet was funded seconds ago.
+            logger.warning("Balance check failed in transit; relying on the last good read.")
+        else:
+            return {"passed": False, "reason": f"Native balance check failed: {native_balance['error']}"}
         if quote.get("error"):
             return {"passed": False, "reason": f"Route validation failed: {quote['error']}"}
-        if price_diff < self._min_profit * 100:
-            return {"passed": False, "reason": f"Profit {price_diff:.3f}% below minimum {self._min_profit * 100:.1f}%"}
         return {"passed": True, "reason": ""}
 
+    async def _preflight_calls(self, path: list[str]) -> tuple[dict, dict]:
+        return await asyncio.gather(
+            self._read_with_retry("get_native_balance", {"address": self._wallet, "network": "bsc-testnet"}),
+            self._read_with_retry("read_contract", {**_QUOTE_CALL, "args": [self._amount_wei_str, path]}),
+        )
+
+    async def _read_with_retry(self, tool_name: str, arguments: dict) -> dict:
+        # Reads are idempotent, so a timeout or dropped transport is retried
+        # with backoff; "rpc" errors are the server's answer and are returned
+        # as-is. Writes never go through here.
+        ttl = _READ_TTL_SECONDS.get(tool_name, 0.0)
+        key = (tool_name, orjson.dumps({k: v for k, v in arguments.items() if k != "abi"}, option=orjson.OPT_SORT_KEYS))
+        cached = self._rpc_cache.get(key)
+        if cached is not None and time.monotonic() - cached[0] < ttl:
+            return cached[1]
+
+        result = await self._mcp.acall_tool(tool_name, arguments)
+        for attempt in range(1, _READ_ATTEMPTS):
+            if result.get("error_type") not in _RETRYABLE_ERRORS:
+                break
+            logger.info("Retrying %s after %s error (attempt %d).", tool_name, result["error_type"], attempt + 1)
+            await asyncio.sleep(_backoff_delay(attempt - 1))
+            result = await self._mcp.acall_tool(tool_name, arguments)
+        if ttl and not result.get("error"):
+            self._rpc_cache[key] = (time.monotonic(), result)
+        return result
+
     def _swap_native_for_token(self, token: str, amount_wei: int) -> dict:
+        return self._mcp.run(self._swap_native_for_token_async(token, amount_wei), timeout=None)
+
+    async def _swap_native_for_token_async(self, token: str, amount_wei: int) -> dict:
         """Swap WBNB tokens for target token (using swapExactTokensForTokens instead of ETH).
         
         This approach wraps BNB first, then approves router, then swaps WBNB→token.
@@ -403,27 +1215,18 @@ class ExecutionAgent:
         path = self._buy_path(token)
         wbnb = TESTNET_TOKENS["BNB"]
         
-        logger.info(f"Approving {amount_wei} WBNB for router...")
-        
-        # Step 1: Approve router to spend WBNB
-        approve_result = self._mcp.call_tool(
-            "write_contract",
-            {
-                "contractAddress": wbnb,
-                "abi": ERC20_APPROVE_ABI,
-                "functionName": "approve",
-                "args": [PANCAKE_V2_ROUTER_TESTNET, str(amount_wei * 2)],  # Approve 2x for safety
-                "network": "bsc-testnet",
-            },
+        # Steps 1-2: make sure the router may spend our WBNB and get a quote;
+        # neither depends on the other.
+        approve_result, amounts = await asyncio.gather(
+            self._ensure_allowance(wbnb, amount_wei),
+            self._get_amounts_out_async(amount_wei, path),
         )
         
         if approve_result.get("error"):
             return {"error": f"Approval failed: {approve_result['error']}"}
         
-        logger.info(f"Approval successful, getting quote...")
+        logger.info("Approval in place, checking quote...")
         
-        # Step 2: Get quote
-        amounts = self._get_amounts_out(amount_wei, path)
         if not amounts:
             return {"error": "Quote failed."}
         expected_out = int(amounts[-1])
@@ -433,7 +1236,7 @@ class ExecutionAgent:
         logger.info(f"Expected output: {expected_out}, calculating slippage tolerance")
         
         # Use 1% slippage
-        min_out = str(max(1, int(expected_out * 0.01)))
+        min_out = str(max(1, expected_out // 100))
         
         logger.info(f"Setting minimum output to {min_out}")
 
@@ -441,182 +1244,118 @@ class ExecutionAgent:
         deadline = int(time.time()) + 300
         swap_args = [str(amount_wei), min_out, path, self._wallet, deadline]
         
-        swap_params = {
-            "contractAddress": PANCAKE_V2_ROUTER_TESTNET,
-            "abi": json.loads(SWAP_ABI_JSON),
-            "functionName": "swapExactTokensForTokens",
-            "args": swap_args,
-            "network": "bsc-testnet",
-        }
+        swap_params = {**_SWAP_CALL, "args": swap_args}
         
-        logger.info(f"Executing swapExactTokensForTokens with params: {json.dumps(swap_params, indent=2)}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Executing swapExactTokensForTokens with params: %s", orjson.dumps(swap_params).decode())
         
-        result = self._mcp.call_tool("write_contract", swap_params)
+        result = await self._mcp.acall_tool("write_contract", swap_params)
+        self.invalidate_reads()
         if result.get("error"): 
             return {"error": f"Swap failed: {result['error']}"}
         tx_hash = self._extract_tx_hash(result)
-        content = result.get("content", [])
-        if not tx_hash or tx_hash == "unknown":
-            for item in content:
-                text = item.get("text", "") if isinstance(item, dict) else str(item)
-                match = _TX_HASH_PATTERN.search(text)
-                if match:
-                    tx_hash = match.group(1)
-                    break
-        if not tx_hash or tx_hash == "unknown":
+        if tx_hash == "unknown":
             return {"error": "Swap response did not include a transaction hash."}
         return {"tx_hash": tx_hash, "amount_out_wei": expected_out}
 
     def _swap_token_for_token(self, token: str, amount_in_wei: int) -> dict:
+        return self._mcp.run(self._swap_token_for_token_async(token, amount_in_wei), timeout=None)
+
+    async def _swap_token_for_token_async(self, token: str, amount_in_wei: int) -> dict:
         """Swap token -> WBNB via router (testnet)."""
         path = self._sell_path(token)
         if not path:
             return {"error": "Invalid sell path."}
         token_in = path[0]
 
-        approve_result = self._mcp.call_tool(
-            "write_contract",
-            {
-                "contractAddress": token_in,
-                "abi": ERC20_APPROVE_ABI,
-                "functionName": "approve",
-                "args": [PANCAKE_V2_ROUTER_TESTNET, str(amount_in_wei * 2)],
-                "network": "bsc-testnet",
-            },
+        approve_result, amounts = await asyncio.gather(
+            self._ensure_allowance(token_in, amount_in_wei),
+            self._get_amounts_out_async(amount_in_wei, path),
         )
         if approve_result.get("error"):
             return {"error": f"Approval failed: {approve_result['error']}"}
 
-        amounts = self._get_amounts_out(amount_in_wei, path)
         if not amounts:
             return {"error": "Quote failed."}
         expected_out = int(amounts[-1])
         if expected_out <= 0:
             return {"error": f"Quote returned zero or negative output: {expected_out}"}
 
-        min_out = str(max(1, int(expected_out * 0.01)))
+        min_out = str(max(1, expected_out // 100))
         deadline = int(time.time()) + 300
         swap_args = [str(amount_in_wei), min_out, path, self._wallet, deadline]
-        swap_params = {
-            "contractAddress": PANCAKE_V2_ROUTER_TESTNET,
-            "abi": json.loads(SWAP_ABI_JSON),
-            "functionName": "swapExactTokensForTokens",
-            "args": swap_args,
-            "network": "bsc-testnet",
-        }
-        result = self._mcp.call_tool("write_contract", swap_params)
+        swap_params = {**_SWAP_CALL, "args": swap_args}
+        result = await self._mcp.acall_tool("write_contract", swap_params)
+        self.invalidate_reads()
         if result.get("error"):
             return {"error": f"Swap failed: {result['error']}"}
         tx_hash = self._extract_tx_hash(result)
-        content = result.get("content", [])
-        if not tx_hash or tx_hash == "unknown":
-            for item in content:
-                text = item.get("text", "") if isinstance(item, dict) else str(item)
-                match = _TX_HASH_PATTERN.search(text)
-                if match:
-                    tx_hash = match.group(1)
-                    break
-        if not tx_hash or tx_hash == "unknown":
+        if tx_hash == "unknown":
             return {"error": "Swap response did not include a transaction hash."}
         return {"tx_hash": tx_hash, "amount_out_wei": expected_out}
 
-    @staticmethod
-    def _extract_tx_hash(result: dict) -> str:
-        def find_hash(value) -> str | None:
-            if value is None:
-                return None
-
-            if isinstance(value, str):
-                match = _TX_HASH_PATTERN.search(value)
-                if match:
-                    return match.group(1)
-                try:
-                    parsed = json.loads(value)
-                except Exception:
-                    return None
-                return find_hash(parsed)
-
-            if isinstance(value, dict):
-                preferred_keys = (
-                    "transactionHash",
-                    "txHash",
-                    "tx_hash",
-                    "hash",
-                    "transaction_hash",
-                )
-                for key in preferred_keys:
-                    if key in value:
-                        candidate = find_hash(value.get(key))
-                        if candidate:
-                            return candidate
-                for nested_value in value.values():
-                    candidate = find_hash(nested_value)
-                    if candidate:
-                        return candidate
-                return None
-
-            if isinstance(value, list):
-                for item in value:
-                    candidate = find_hash(item)
-                    if candidate:
-                        return candidate
-                return None
+    async def _ensure_allowance(self, token_addr: str, amount_wei: int) -> dict:
+        """Approve the router for *token_addr* unless its allowance already covers *amount_wei*."""
+        allowance = await self._read_with_retry(
+            "read_contract",
+            {**_ALLOWANCE_CALL, "contractAddress": token_addr, "args": [self._wallet, PANCAKE_V2_ROUTER_TESTNET]},
+        )
+        current = allowance.get("result")
+        if isinstance(current, (int, str)) and str(current).strip().isdigit() and int(current) >= amount_wei:
+            return {}
 
-            return None
+        # Approve the maximum once so later swaps of this token skip the write.
+        logger.info("Approving router to spend %s.", token_addr)
+        return await self._mcp.acall_tool(
+            "write_contract",
+            {**_APPROVE_CALL, "contractAddress": token_addr, "args": [PANCAKE_V2_ROUTER_TESTNET, str(_MAX_UINT256)]},
+        )
 
-        return find_hash(result) or "unknown"
+    @staticmethod
+    def _extract_tx_hash(result: dict) -> str:
+        parsed = result.get("result")
+        if isinstance(parsed, dict):
+            for key in _TX_HASH_KEYS:
+                value = parsed.get(key)
+                if isinstance(value, str) and (match := _find_tx_hash(value)):
+                    return match
+
+        # The tool's text block nearly always carries the hash; try it directly
+        # and leave the full walk for odd response shapes.
+        try:
+            match = _find_tx_hash(result["content"][0]["text"])
+        except (KeyError, IndexError, TypeError, AttributeError):
+            match = None
+        return match or _search_tx_hash(result) or "unknown"
 
     @staticmethod
     def _buy_path(token: str) -> list[str]:
-        wbnb = TESTNET_TOKENS["BNB"].lower()
-        busd = TESTNET_TOKENS["BUSD"].lower()
-        token_addr = TESTNET_TOKENS.get(token.upper())
-        if not token_addr:
-            return []
-        token_addr = token_addr.lower()
-        if token_addr == wbnb:
-            return []
-        if token_addr == busd:
-            return [wbnb, busd]
-        return [wbnb, busd, token_addr]
+        return list(_swap_path(token.upper(), buy=True))
 
     @staticmethod
     def _sell_path(token: str) -> list[str]:
-        wbnb = TESTNET_TOKENS["BNB"].lower()
-        busd = TESTNET_TOKENS["BUSD"].lower()
-        token_addr = TESTNET_TOKENS.get(token.upper())
-        if not token_addr:
-            return []
-        token_addr = token_addr.lower()
-        if token_addr == busd:
-            return [busd, wbnb]
-        return [token_addr, busd, wbnb]
+        return list(_swap_path(token.upper(), buy=False))
 
     def _swap_pair(self, token: str, direction: str) -> tuple[str, str]:
-        stable = TESTNET_TOKENS.get("BUSD", TESTNET_TOKENS["BNB"])
-        token_addr = TESTNET_TOKENS.get(token, TESTNET_TOKENS["BNB"])
-        if direction == "BUY_DEX_SELL_CEX": return stable, token_addr
-        return token_addr, stable
+        return _swap_pair(token, direction)
 
     @staticmethod
     def _to_wei(amount: float, decimals: int = 18) -> int:
-        return int(amount * (10 ** decimals))
+        return int(amount * (_WEI_MULT if decimals == 18 else 10 ** decimals))
 
     def _get_amounts_out(self, amount_in_wei: int, path: list[str]) -> list[int] | None:
-        quote = self._mcp.call_tool(
-            "read_contract",
-            {
-                "contractAddress": PANCAKE_V2_ROUTER_TESTNET,
-                "abi": json.loads(ROUTER_ABI_JSON),
-                "functionName": "getAmountsOut",
-                "args": [str(amount_in_wei), path],
-                "network": "bsc-testnet",
-            },
-        )
+        return self._mcp.run(self._get_amounts_out_async(amount_in_wei, path), timeout=None)
+
+    async def _get_amounts_out_async(self, amount_in_wei: int, path: list[str]) -> list[int] | None:
+        quote = await self._read_with_retry("read_contract", {**_QUOTE_CALL, "args": [str(amount_in_wei), path]})
         if quote.get("error"):
             return None
         result = quote.get("result")
         if isinstance(result, str):
+            # _try_parse_json has already run on the tool text; a string left
+            # here is only worth parsing if it is a double-encoded list.
+            if not result.lstrip().startswith("["):
+                return None
             try:
                 amounts = json.loads(result)
             except json.JSONDecodeError:
@@ -630,84 +1369,102 @@ class ExecutionAgent:
         return [int(a) for a in amounts]
 
     def _estimate_gas_bnb(self, amount_in_wei: int, buy_path: list[str], sell_path: list[str]) -> float | None:
+        return self._mcp.run(self._estimate_gas_bnb_async(amount_in_wei, buy_path, sell_path), timeout=None)
+
+    async def _estimate_gas_bnb_async(self, amount_in_wei: int, buy_path: list[str], sell_path: list[str]) -> float | None:
         if not self._wallet:
             return None
-        try:
-            from web3 import Web3
-        except Exception:
-            return None
 
         try:
-            web3 = Web3(Web3.HTTPProvider(BSC_TESTNET_RPC))
-            if not web3.is_connected():
+            web3 = await self._gas_web3()
+            if web3 is None:
                 return None
 
-            wallet = Web3.to_checksum_address(self._wallet)
-            router = web3.eth.contract(
-                address=Web3.to_checksum_address(PANCAKE_V2_ROUTER_TESTNET),
-                abi=ROUTER_ABI,
-            )
+            wallet = _checksum(self._wallet)
+            router = self._router_contract
 
             def checksum_path(path: list[str]) -> list[str]:
-                return [Web3.to_checksum_address(p) for p in path]
-
-            gas_price = web3.eth.gas_price
-            deadline = int(time.time()) + 300
-
-            total_gas = 0
+                return [_checksum(p) for p in path]
 
-            # Approve WBNB for buy leg
-            wbnb = Web3.to_checksum_address(TESTNET_TOKENS["BNB"])
-            erc20 = web3.eth.contract(address=wbnb, abi=ERC20_APPROVE_ABI)
-            try:
-                gas = erc20.functions.approve(PANCAKE_V2_ROUTER_TESTNET, amount_in_wei * 2).estimate_gas({"from": wallet})
-                total_gas += gas
-            except Exception:
-                pass
-
-            # Buy swap
-            try:
-                gas = router.functions.swapExactTokensForTokens(
-                    amount_in_wei,
-                    1,
-                    checksum_path(buy_path),
-                    wallet,
-                    deadline,
-                ).estimate_gas({"from": wallet})
-                total_gas += gas
-            except Exception:
-                pass
-
-            # Approve token for sell leg
-            token_in = Web3.to_checksum_address(sell_path[0])
-            erc20_sell = web3.eth.contract(address=token_in, abi=ERC20_APPROVE_ABI)
-            try:
-                gas = erc20_sell.functions.approve(PANCAKE_V2_ROUTER_TESTNET, amount_in_wei * 2).estimate_gas({"from": wallet})
-                total_gas += gas
-            except Exception:
-                pass
-
-            # Sell swap
-            try:
-                gas = router.functions.swapExactTokensForTokens(
-                    amount_in_wei,
-                    1,
-                    checksum_path(sell_path),
-                    wallet,
-                    deadline,
-                ).estimate_gas({"from": wallet})
-                total_gas += gas
-            except Exception:
-                pass
+            async def estimate(build_call) -> int:
+                # Each leg fails independently (e.g. a reverting swap), as before.
+                try:
+                    return await build_call().estimate_gas({"from": wallet})
+                except Exception:
+                    return 0
 
+            deadline = int(time.time()) + 300
+            wbnb     = _checksum(TESTNET_TOKENS["BNB"])
+            token_in = _checksum(sell_path[0])
+            approve_buy  = self._erc20_for(wbnb)
+            approve_sell = self._erc20_for(token_in)
+
+            # The gas price and the four leg estimates are independent reads.
+            gas_price, *legs = await asyncio.gather(
+                web3.eth.gas_price,
+                estimate(lambda: approve_buy.functions.approve(PANCAKE_V2_ROUTER_TESTNET, amount_in_wei * 2)),
+                estimate(lambda: router.functions.swapExactTokensForTokens(amount_in_wei, 1, checksum_path(buy_path), wallet, deadline)),
+                estimate(lambda: approve_sell.functions.approve(PANCAKE_V2_ROUTER_TESTNET, amount_in_wei * 2)),
+                estimate(lambda: router.functions.swapExactTokensForTokens(amount_in_wei, 1, checksum_path(sell_path), wallet, deadline)),
+            )
+            total_gas = sum(legs)
             if total_gas <= 0:
                 return None
             return (total_gas * gas_price) / 1e18
         except Exception:
             return None
 
+    async def _gas_web3(self):
+        """Shared web3 client for gas estimates; connects and builds the router once."""
+        if self._web3 is not None:
+            return self._web3
+        try:
+            from aiohttp import ClientTimeout
+            from web3 import AsyncHTTPProvider, AsyncWeb3
+        except Exception:
+            return None
+
+        # The provider keeps one pooled aiohttp session per endpoint on this loop.
+        web3 = AsyncWeb3(AsyncHTTPProvider(BSC_TESTNET_RPC, request_kwargs={"timeout": ClientTimeout(total=10)}))
+        if not await web3.is_connected():
+            return None
+        self._router_contract = web3.eth.contract(
+            address=_checksum(PANCAKE_V2_ROUTER_TESTNET),
+            abi=ROUTER_ABI + SWAP_EXACT_TOKENS_FOR_TOKENS_ABI,
+        )
+        self._web3 = web3
+        return web3
+
+    def _erc20_for(self, address: str):
+        contract = self._erc20_contracts.get(address)
+        if contract is None:
+            contract = self._erc20_contracts[address] = self._web3.eth.contract(address=address, abi=ERC20_APPROVE_ABI)
+        return contract
+
+    async def _two_leg_estimates(self, amount_wei: int, buy_path: list[str], sell_path: list[str]) -> tuple:
+        if self._gas_estimate_bnb > 0:
+            # The operator fixed the gas cost; don't spend RPCs estimating it.
+            return self._gas_estimate_bnb, await self._get_amounts_out_async(amount_wei, buy_path)
+        return await asyncio.gather(
+            self._cached_gas_estimate(amount_wei, buy_path, sell_path),
+            self._get_amounts_out_async(amount_wei, buy_path),
+        )
+
+    async def _cached_gas_estimate(self, amount_wei: int, buy_path: list[str], sell_path: list[str]) -> float | None:
+        # Gas barely depends on the amount, so bucket it by power of two.
+        key = (tuple(buy_path), tuple(sell_path), amount_wei.bit_length())
+        cached = self._gas_cache.get(key)
+        if cached is not None and time.monotonic() - cached[0] < _GAS_TTL_SECONDS:
+            return cached[1]
+        gas_bnb = await self._estimate_gas_bnb_async(amount_wei, buy_path, sell_path)
+        if gas_bnb:
+            self._gas_cache[key] = (time.monotonic(), gas_bnb)
+        return gas_bnb
+
     def _build_result(self, token: str, direction: str, status: str, reason: str, decision: dict, tx_hash: str = "N/A", profit_pct: float = 0.0, amount_out: int = 0) -> dict:
-        return {"token_in": token if direction == "BUY_CEX_SELL_DEX" else "BUSD", "token_out": "BUSD" if direction == "BUY_CEX_SELL_DEX" else token, "amount": self._amount_bnb, "amount_out_wei": amount_out, "direction": direction, "status": status, "tx_hash": tx_hash, "profit_estimate_pct": round(profit_pct, 4), "market_phase": decision.get("market_phase", "UNKNOWN"), "sentiment_signal": decision.get("sentiment_signal", 0.0), "confidence_score": decision.get("confidence_score", 0), "risk_level": decision.get("risk_level", "UNKNOWN"), "reason": reason or decision.get("reason", ""), "chain_id": BSC_TESTNET_CHAIN_ID, "router": PANCAKE_V2_ROUTER_TESTNET, "timestamp": datetime.utcnow().isoformat(), "circuit_breaker": self._breaker.status}
+        token_in, token_out = _trade_labels(token, direction)
+        now_ns              = time.time_ns()
+        return {**self._result_template, "token_in": token_in, "token_out": token_out, "amount_out_wei": amount_out, "direction": direction, "status": status, "tx_hash": tx_hash, "profit_estimate_pct": round(profit_pct, 4), "market_phase": decision.get("market_phase", "UNKNOWN"), "sentiment_signal": decision.get("sentiment_signal", 0.0), "confidence_score": decision.get("confidence_score", 0), "risk_level": decision.get("risk_level", "UNKNOWN"), "reason": reason or decision.get("reason", ""), "timestamp_ns": now_ns, "timestamp": _iso_from_ns(now_ns), "circuit_breaker": self._breaker.status}
 
     @property
     def trade_history(self) -> list[dict]: return self._logger.recent(50)
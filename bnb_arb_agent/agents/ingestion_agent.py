@@ -1,17 +1,25 @@
 """Data ingestion agent — collects crypto news from multiple sources."""
 
 import abc
+import asyncio
+import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Any
+from typing import Any, Optional
 
+import aiohttp
 import feedparser
+import orjson
 import pandas as pd
 import requests
 from bs4 import BeautifulSoup
 from gnews import GNews
 from pytrends.request import TrendReq
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from config import Config
+from core.cache import cached
 from core.logger import get_logger
 
 logger = get_logger(__name__)
@@ -21,6 +29,49 @@ Article = dict[str, Any]
 
 _DEFAULT_HEADERS = {"User-Agent": "Mozilla/5.0 (compatible; BNBArbBot/1.0)"}
 
+# Keep-alive session for the sync fetch paths so repeat calls reuse TCP and TLS
+# connections; transient gateway errors are retried with backoff by the adapter.
+_SESSION = requests.Session()
+_SESSION.headers.update(_DEFAULT_HEADERS)
+_ADAPTER = HTTPAdapter(
+    pool_connections=20,
+    pool_maxsize=20,
+    max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=[429, 502, 503, 504]),
+)
+_SESSION.mount("https://", _ADAPTER)
+_SESSION.mount("http://", _ADAPTER)
+
+# feedparser.parse blocks on the network for each feed; fetching them side by
+# side bounds the RSS stage by the slowest feed rather than the sum of all.
+_FEED_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="rss-io")
+
+_HTTP_TIMEOUT = aiohttp.ClientTimeout(total=10)
+
+# News and trending lists move on minute granularity, search trends slower;
+# repeated runs inside these windows are served from memory.
+_NEWS_TTL_SECONDS   = 60
+_TRENDS_TTL_SECONDS = 300
+
+
+def _unique_by_title(batches: list[list[Article]]) -> list[Article]:
+    """Flatten source batches, keeping the first article seen for each title."""
+    seen:     set[str]      = set()
+    articles: list[Article] = []
+    for batch in batches:
+        for article in batch:
+            title = article.get("title", "")
+            if title not in seen:
+                seen.add(title)
+                articles.append(article)
+    return articles
+
+
+def _keyword_pattern(keywords: list[str]) -> Optional[re.Pattern]:
+    """Compile keywords into one case-insensitive alternation; None matches every title."""
+    if not keywords:
+        return None
+    return re.compile("|".join(map(re.escape, keywords)), re.IGNORECASE)
+
 
 class BaseIngester(abc.ABC):
     """Interface that every data source ingester must implement."""
@@ -34,6 +85,7 @@ class GNewsIngester(BaseIngester):
     def __init__(self) -> None:
         self._client = GNews(language="en", country="US", period="1d", max_results=15)
 
+    @cached(_NEWS_TTL_SECONDS)
     def fetch(self, query: str = "BNB") -> list[Article]:
         try:
             articles = self._client.get_news(query)
@@ -66,55 +118,108 @@ class RSSIngester(BaseIngester):
         "U.Today":        "https://u.today/rss",
     }
 
+    def __init__(self) -> None:
+        # feed name -> validators and entries of the last full response, for conditional GETs.
+        self._etags:        dict[str, str]  = {}
+        self._modified:     dict[str, str]  = {}
+        self._last_entries: dict[str, list] = {}
+
+    @cached(_NEWS_TTL_SECONDS)
     def fetch(self, keywords: list[str] = None) -> list[Article]:
-        keywords = keywords or []
-        results  = []
-        for name, url in self._FEEDS.items():
+        pattern = _keyword_pattern(keywords or [])
+        batches = _FEED_POOL.map(lambda feed: self._fetch_feed(*feed, pattern), self._FEEDS.items())
+        return [article for batch in batches for article in batch]
+
+    @cached(_NEWS_TTL_SECONDS, skip=2)
+    async def fetch_async(self, session: aiohttp.ClientSession, keywords: list[str] = None) -> list[Article]:
+        """Async counterpart of fetch(): download every feed concurrently, then parse.
+
+        Parsing runs serially in one worker thread, so at most one parse tree is
+        alive at a time and the event loop stays free while it runs.
+        """
+        bodies  = await asyncio.gather(*(self._download(session, *feed) for feed in self._FEEDS.items()))
+        pattern = _keyword_pattern(keywords or [])
+        return await asyncio.to_thread(self._parse_bodies, dict(zip(self._FEEDS, bodies)), pattern)
+
+    def _fetch_feed(self, name: str, url: str, pattern: Optional[re.Pattern]) -> list[Article]:
+        try:
+            feed = feedparser.parse(url, etag=self._etags.get(name), modified=self._modified.get(name))
+            if feed.get("status") == 304:
+                return self._articles(name, self._last_entries.get(name, []), pattern)
+            self._remember(name, feed.get("etag"), feed.get("modified"))
+            return self._articles(name, self._store_entries(name, feed), pattern)
+        except Exception:
+            logger.warning("RSS feed failed: %s", name)
+            return []
+
+    async def _download(self, session: aiohttp.ClientSession, name: str, url: str) -> Optional[bytes]:
+        """Return the feed body, b"" when unchanged since the last fetch, or None on failure."""
+        headers = {}
+        if etag := self._etags.get(name):
+            headers["If-None-Match"] = etag
+        if modified := self._modified.get(name):
+            headers["If-Modified-Since"] = modified
+        try:
+            async with session.get(url, headers=headers, timeout=_HTTP_TIMEOUT) as response:
+                if response.status == 304:
+                    return b""
+                response.raise_for_status()
+                body = await response.read()
+                self._remember(name, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+                return body
+        except Exception:
+            logger.warning("RSS feed failed: %s", name)
+            return None
+
+    def _parse_bodies(self, bodies: dict[str, Optional[bytes]], pattern: Optional[re.Pattern]) -> list[Article]:
+        results = []
+        for name, body in bodies.items():
+            if body is None:
+                continue
             try:
-                feed = feedparser.parse(url)
-                for entry in feed.entries[:10]:
-                    title = entry.get("title", "")
-                    if not keywords or any(k.lower() in title.lower() for k in keywords):
-                        results.append({
-                            "source":    f"RSS/{name}",
-                            "title":     title,
-                            "content":   entry.get("summary", "")[:400],
-                            "url":       entry.get("link", ""),
-                            "timestamp": entry.get("published", ""),
-                        })
+                entries = self._store_entries(name, feedparser.parse(body)) if body else self._last_entries.get(name, [])
+                results.extend(self._articles(name, entries, pattern))
             except Exception:
                 logger.warning("RSS feed failed: %s", name)
         return results
 
+    def _remember(self, name: str, etag: Optional[str], modified: Optional[str]) -> None:
+        if etag:
+            self._etags[name] = etag
+        if modified:
+            self._modified[name] = modified
+
+    def _store_entries(self, name: str, feed: feedparser.FeedParserDict) -> list:
+        self._last_entries[name] = feed.entries[:10]
+        return self._last_entries[name]
+
+    @staticmethod
+    def _articles(name: str, entries: list, pattern: Optional[re.Pattern]) -> list[Article]:
+        results = []
+        for entry in entries:
+            title = entry.get("title", "")
+            if pattern is None or pattern.search(title):
+                results.append({
+                    "source":    f"RSS/{name}",
+                    "title":     title,
+                    "content":   entry.get("summary", "")[:400],
+                    "url":       entry.get("link", ""),
+                    "timestamp": entry.get("published", ""),
+                })
+        return results
+
 
 class CryptoPanicIngester(BaseIngester):
     _BASE_URL = "https://cryptopanic.com/api/developer/v2/posts/"
 
+    @cached(_NEWS_TTL_SECONDS)
     def fetch(self, currencies: str = "BNB,CAKE") -> list[Article]:
         if not config.cryptopanic_key:
             return []
         try:
-            response = requests.get(
-                self._BASE_URL,
-                params={
-                    "auth_token": config.cryptopanic_key,
-                    "currencies": currencies,
-                    "filter":     "hot",
-                    "public":     "true",
-                },
-                timeout=10,
-            )
+            response = _SESSION.get(self._BASE_URL, params=self._params(currencies), timeout=10)
             response.raise_for_status()
-            return [
-                {
-                    "source":    f"CryptoPanic/{p.get('source', {}).get('title', 'CP')}",
-                    "title":     p.get("title", ""),
-                    "content":   "",
-                    "url":       p.get("url", ""),
-                    "timestamp": p.get("published_at", ""),
-                }
-                for p in response.json().get("results", [])
-            ]
+            return self._articles(orjson.loads(response.content))
         except requests.HTTPError as exc:
             logger.warning("CryptoPanic request failed: %s", exc)
             return []
@@ -122,6 +227,44 @@ class CryptoPanicIngester(BaseIngester):
             logger.exception("CryptoPanic ingestion error.")
             return []
 
+    @cached(_NEWS_TTL_SECONDS, skip=2)
+    async def fetch_async(self, session: aiohttp.ClientSession, currencies: str = "BNB,CAKE") -> list[Article]:
+        """Async counterpart of fetch() over a caller-owned aiohttp session."""
+        if not config.cryptopanic_key:
+            return []
+        try:
+            async with session.get(self._BASE_URL, params=self._params(currencies), timeout=_HTTP_TIMEOUT) as response:
+                response.raise_for_status()
+                return self._articles(orjson.loads(await response.read()))
+        except aiohttp.ClientResponseError as exc:
+            logger.warning("CryptoPanic request failed: %s", exc)
+            return []
+        except Exception:
+            logger.exception("CryptoPanic ingestion error.")
+            return []
+
+    @staticmethod
+    def _params(currencies: str) -> dict[str, str]:
+        return {
+            "auth_token": config.cryptopanic_key,
+            "currencies": currencies,
+            "filter":     "hot",
+            "public":     "true",
+        }
+
+    @staticmethod
+    def _articles(data: dict) -> list[Article]:
+        return [
+            {
+                "source":    f"CryptoPanic/{p.get('source', {}).get('title', 'CP')}",
+                "title":     p.get("title", ""),
+                "content":   "",
+                "url":       p.get("url", ""),
+                "timestamp": p.get("published_at", ""),
+            }
+            for p in data.get("results", [])
+        ]
+
 
 class GoogleTrendsIngester(BaseIngester):
     def __init__(self) -> None:
@@ -137,6 +280,7 @@ class GoogleTrendsIngester(BaseIngester):
             logger.warning("Google Trends client could not initialise.")
             return False
 
+    @cached(_TRENDS_TTL_SECONDS)
     def fetch(self, keywords: list[str] = None) -> list[Article]:
         keywords = keywords or []
         if not keywords or not self._connect():
@@ -164,69 +308,124 @@ class GoogleTrendsIngester(BaseIngester):
 
 
 class WebScraper(BaseIngester):
+    _BITCOINTALK_URL = "https://bitcointalk.org/index.php?action=search2&search={keyword}&sort_order=DESC"
+    _4CHAN_URL       = "https://a.4cdn.org/biz/catalog.json"
+
     def fetch(self, keyword: str = "BNB") -> list[Article]:
         return self._scrape_bitcointalk(keyword) + self._scrape_4chan(keyword)
 
+    async def fetch_async(self, session: aiohttp.ClientSession, keyword: str = "BNB") -> list[Article]:
+        """Async counterpart of fetch(); both boards are scraped concurrently."""
+        bitcointalk, fourchan = await asyncio.gather(
+            self._scrape_bitcointalk_async(session, keyword),
+            self._scrape_4chan_async(session, keyword),
+        )
+        return bitcointalk + fourchan
+
     def _scrape_bitcointalk(self, keyword: str) -> list[Article]:
         try:
-            url  = f"https://bitcointalk.org/index.php?action=search2&search={keyword}&sort_order=DESC"
-            soup = BeautifulSoup(requests.get(url, headers=_DEFAULT_HEADERS, timeout=10).text, "html.parser")
-            return [
-                {
-                    "source":    "Bitcointalk",
-                    "title":     link.text.strip(),
-                    "content":   "",
-                    "url":       link.get("href", ""),
-                    "timestamp": datetime.utcnow().isoformat(),
-                }
-                for row in soup.select("td.windowbg")[:10]
-                if (link := row.find("a"))
-            ]
+            url = self._BITCOINTALK_URL.format(keyword=keyword)
+            return self._parse_bitcointalk(_SESSION.get(url, timeout=10).text)
+        except Exception:
+            logger.warning("Bitcointalk scrape failed.")
+            return []
+
+    async def _scrape_bitcointalk_async(self, session: aiohttp.ClientSession, keyword: str) -> list[Article]:
+        try:
+            url = self._BITCOINTALK_URL.format(keyword=keyword)
+            async with session.get(url, headers=_DEFAULT_HEADERS, timeout=_HTTP_TIMEOUT) as response:
+                html = await response.text()
+            # Parsing is CPU-bound; keep it off the loop the other sources share.
+            return await asyncio.to_thread(self._parse_bitcointalk, html)
         except Exception:
             logger.warning("Bitcointalk scrape failed.")
             return []
 
+    @staticmethod
+    def _parse_bitcointalk(html: str) -> list[Article]:
+        soup = BeautifulSoup(html, "lxml")
+        return [
+            {
+                "source":    "Bitcointalk",
+                "title":     link.text.strip(),
+                "content":   "",
+                "url":       link.get("href", ""),
+                "timestamp": datetime.utcnow().isoformat(),
+            }
+            for row in soup.select("td.windowbg")[:10]
+            if (link := row.find("a"))
+        ]
+
     def _scrape_4chan(self, keyword: str) -> list[Article]:
         try:
-            data = requests.get("https://a.4cdn.org/biz/catalog.json", timeout=10).json()
-            results = []
-            for page in data:
-                for thread in page.get("threads", []):
-                    text = (thread.get("sub") or "") + (thread.get("com") or "")
-                    if keyword.lower() not in text.lower():
-                        continue
-                    results.append({
-                        "source":    "4chan/biz",
-                        "title":     (thread.get("sub") or thread.get("com") or "")[:100],
-                        "content":   (thread.get("com") or "")[:400],
-                        "url":       f"https://boards.4channel.org/biz/thread/{thread['no']}",
-                        "timestamp": datetime.utcfromtimestamp(thread.get("time", 0)).isoformat(),
-                    })
-            return results
+            return self._parse_4chan(orjson.loads(_SESSION.get(self._4CHAN_URL, timeout=10).content), keyword)
         except Exception:
             logger.warning("4chan scrape failed.")
             return []
 
+    async def _scrape_4chan_async(self, session: aiohttp.ClientSession, keyword: str) -> list[Article]:
+        try:
+            async with session.get(self._4CHAN_URL, timeout=_HTTP_TIMEOUT) as response:
+                data = orjson.loads(await response.read())
+            return self._parse_4chan(data, keyword)
+        except Exception:
+            logger.warning("4chan scrape failed.")
+            return []
+
+    @staticmethod
+    def _parse_4chan(data: list, keyword: str) -> list[Article]:
+        pattern = _keyword_pattern([keyword] if keyword else [])
+        results = []
+        for page in data:
+            for thread in page.get("threads", []):
+                text = (thread.get("sub") or "") + (thread.get("com") or "")
+                if pattern is not None and not pattern.search(text):
+                    continue
+                results.append({
+                    "source":    "4chan/biz",
+                    "title":     (thread.get("sub") or thread.get("com") or "")[:100],
+                    "content":   (thread.get("com") or "")[:400],
+                    "url":       f"https://boards.4channel.org/biz/thread/{thread['no']}",
+                    "timestamp": datetime.utcfromtimestamp(thread.get("time", 0)).isoformat(),
+                })
+        return results
+
 
 class CoinGeckoTrendIngester(BaseIngester):
+    _URL = "https://api.coingecko.com/api/v3/search/trending"
+
+    @cached(_NEWS_TTL_SECONDS)
     def fetch(self) -> list[Article]:
         try:
-            data = requests.get("https://api.coingecko.com/api/v3/search/trending", timeout=8).json()
-            return [
-                {
-                    "source":    "CoinGecko/Trending",
-                    "title":     f"{c['name']} ({c['symbol']}) trending #{c['market_cap_rank']}",
-                    "content":   f"Price BTC: {c.get('price_btc', 0):.8f}",
-                    "url":       f"https://coingecko.com/en/coins/{c['id']}",
-                    "timestamp": datetime.utcnow().isoformat(),
-                }
-                for item in data.get("coins", [])
-                if (c := item["item"])
-            ]
+            return self._articles(orjson.loads(_SESSION.get(self._URL, timeout=8).content))
         except Exception:
             logger.warning("CoinGecko trending fetch failed.")
             return []
 
+    @cached(_NEWS_TTL_SECONDS, skip=2)
+    async def fetch_async(self, session: aiohttp.ClientSession) -> list[Article]:
+        """Async counterpart of fetch() over a caller-owned aiohttp session."""
+        try:
+            async with session.get(self._URL, timeout=aiohttp.ClientTimeout(total=8)) as response:
+                return self._articles(orjson.loads(await response.read()))
+        except Exception:
+            logger.warning("CoinGecko trending fetch failed.")
+            return []
+
+    @staticmethod
+    def _articles(data: dict) -> list[Article]:
+        return [
+            {
+                "source":    "CoinGecko/Trending",
+                "title":     f"{c['name']} ({c['symbol']}) trending #{c['market_cap_rank']}",
+                "content":   f"Price BTC: {c.get('price_btc', 0):.8f}",
+                "url":       f"https://coingecko.com/en/coins/{c['id']}",
+                "timestamp": datetime.utcnow().isoformat(),
+            }
+            for item in data.get("coins", [])
+            if (c := item["item"])
+        ]
+
 
 class DataIngestionAgent:
     """Orchestrates all ingesters and returns a deduplicated DataFrame."""
@@ -240,25 +439,27 @@ class DataIngestionAgent:
         self._coingecko  = CoinGeckoTrendIngester()
 
     def run(self, tokens: list[str] = None, keywords: list[str] = None) -> pd.DataFrame:
+        return asyncio.run(self.run_async(tokens, keywords))
+
+    async def run_async(self, tokens: list[str] = None, keywords: list[str] = None) -> pd.DataFrame:
+        """Fetch every source concurrently; blocking client libraries run in worker threads."""
         tokens   = tokens   or config.target_tokens
         keywords = keywords or config.search_keywords
-        articles: list[Article] = []
 
         logger.info("Fetching from all sources.")
 
-        for keyword in keywords[:3]:
-            articles += self._gnews.fetch(query=keyword)
-
-        articles += self._rss.fetch(keywords=keywords)
-        articles += self._cryptopanic.fetch(currencies=",".join(tokens))
-        articles += self._trends.fetch(keywords=tokens[:5])
-        articles += self._coingecko.fetch()
-
-        for token in tokens[:2]:
-            articles += self._scraper.fetch(keyword=token)
-
-        dataframe = pd.DataFrame(articles).drop_duplicates(subset=["title"])
+        connector = aiohttp.TCPConnector(limit=20)
+        async with aiohttp.ClientSession(connector=connector, headers=_DEFAULT_HEADERS) as session:
+            batches = await asyncio.gather(
+                *(asyncio.to_thread(self._gnews.fetch, query=keyword) for keyword in keywords[:3]),
+                self._rss.fetch_async(session, keywords=keywords),
+                self._cryptopanic.fetch_async(session, currencies=",".join(tokens)),
+                asyncio.to_thread(self._trends.fetch, keywords=tokens[:5]),
+                self._coingecko.fetch_async(session),
+                *(self._scraper.fetch_async(session, keyword=token) for token in tokens[:2]),
+            )
+        dataframe = pd.DataFrame(_unique_by_title(batches))
         dataframe["fetched_at"] = datetime.utcnow().isoformat()
 
         logger.info("Collected %d items from %d sources.", len(dataframe), dataframe["source"].nunique())
-        return dataframe
\ No newline at end of file
+        return dataframe
@@ -4,6 +4,7 @@
 #           Liquidity Changes, Narrative Keywords, Holder Distribution
 # Predicts:  Momentum Building, Distribution Phase, Accumulation Phase, Volatility Spikes
 
+import orjson
 import requests
 import time
 from datetime import datetime, timedelta
@@ -271,7 +272,9 @@ class LiquidityMonitor:
         try:
             # DeFiLlama TVL
             protocol = self.PROTOCOL_SLUGS.get(token, "pancakeswap")
-            data = requests.get(f"{self.DEFILLAMA_BASE}/protocol/{protocol}", timeout=8).json()
+            # The protocol payload carries the full TVL history (several MB);
+            # orjson parses the raw bytes without requests' text decode.
+            data = orjson.loads(requests.get(f"{self.DEFILLAMA_BASE}/protocol/{protocol}", timeout=8).content)
 
             tvl_data = data.get("tvl", [])
             if tvl_data and len(tvl_data) >= 2:
@@ -299,7 +299,7 @@ def create_app() -> Flask:
             from core.constants import TESTNET_TOKENS
             from agents.ingestion_agent import DataIngestionAgent
             from agents.analysis_agent import AnalysisAgent
-            from agents.decision_agent import DecisionAgent
+            from agents.decision_agent import DecisionAgent, fetch_cex_prices
             from agents.onchain_intelligence_agent import OnChainIntelligenceAgent
 
             config = Config()
@@ -315,6 +315,7 @@ def create_app() -> Flask:
             dataframe = ingestion.run()
             texts = (dataframe["title"] + " " + dataframe["content"]).dropna().tolist()
 
+            cex_cache = fetch_cex_prices(tokens)
             scored: list[dict[str, Any]] = []
             for token in tokens:
                 token_texts = [t for t in texts if token.lower() in t.lower()]
@@ -327,7 +328,7 @@ def create_app() -> Flask:
                     token_df = dataframe.head(10)
 
                 sentiment = analysis.run(token_df, token)
-                decision = decision_agent.evaluate_with_intelligence(sentiment, intel, token)
+                decision = decision_agent.evaluate_with_intelligence(sentiment, intel, token, cex_cache=cex_cache)
 
                 scored.append({
                     "token": token,
@@ -53,6 +53,10 @@ class Config:
     # MCP server
     mcp_server_url: str        = field(default_factory=lambda: _optional("MCP_SERVER_URL", "http://localhost:3001"))
 
+    # CEX price source — point at a local coingecko-cache sidecar to share one
+    # rate-limited upstream across agents (e.g. http://localhost:8080/api/v3).
+    coingecko_cache_url: str   = field(default_factory=lambda: _optional("COINGECKO_CACHE_URL"))
+
     # Trade execution
     trade_amount_bnb: float    = field(default_factory=lambda: float(_optional("TRADE_AMOUNT_BNB", "0.01")))
     min_profit_threshold: float = field(default_factory=lambda: float(_optional("MIN_PROFIT_THRESHOLD", "0.005")))
@@ -71,6 +75,7 @@ class Config:
         "BNB arbitrage", "pancakeswap arbitrage",
         "BNB listing", "BNB bullish",
     ])
+    decision_history_cap: int    = field(default_factory=lambda: int(_optional("DECISION_HISTORY_CAP", "10000")))
     sentiment_threshold: float   = 0.3
     price_diff_threshold: float  = 0.005
     poll_interval_seconds: int   = 120
@@ -84,4 +89,7 @@ class Config:
         }
         for attr, env_key in optional_keys.items():
             if not getattr(self, attr):
-                logger.warning("Optional key %s not set — related data source will be skipped.", env_key)
\ No newline at end of file
+                logger.warning("Optional key %s not set — related data source will be skipped.", env_key)
+
+        if self.decision_history_cap < 1:
+            raise ConfigurationError("DECISION_HISTORY_CAP must be at least 1.")
\ No newline at end of file
@@ -0,0 +1,55 @@
+"""In-process TTL cache for ingester fetches."""
+
+import functools
+import inspect
+import time
+from typing import Any, Callable
+
+# (qualified name, argument repr) -> (monotonic store time, result); shared process-wide.
+_store: dict[tuple[str, str], tuple[float, Any]] = {}
+
+
+def clear_cache() -> None:
+    _store.clear()
+
+
+def cached(ttl: float, skip: int = 1) -> Callable:
+    """Memoise a fetch for ``ttl`` seconds.
+
+    The first ``skip`` positional arguments (``self``, and the session for async
+    fetches) are left out of the key. Empty results are not stored, so a failed
+    fetch is retried on the next call rather than served for the whole TTL.
+    """
+    def decorator(func: Callable) -> Callable:
+        def key_for(args: tuple, kwargs: dict) -> tuple[str, str]:
+            return func.__qualname__, repr((args[skip:], sorted(kwargs.items())))
+
+        def lookup(key: tuple[str, str]) -> Any:
+            hit = _store.get(key)
+            if hit and time.monotonic() - hit[0] < ttl:
+                return list(hit[1])
+            return None
+
+        def store(key: tuple[str, str], result: Any) -> Any:
+            if result:
+                _store[key] = (time.monotonic(), result)
+            return result
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                key = key_for(args, kwargs)
+                if (hit := lookup(key)) is not None:
+                    return hit
+                return store(key, await func(*args, **kwargs))
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = key_for(args, kwargs)
+            if (hit := lookup(key)) is not None:
+                return hit
+            return store(key, func(*args, **kwargs))
+        return wrapper
+
+    return decorator
@@ -1,8 +1,5 @@
 """Immutable constants: network addresses, ABIs, and external URLs."""
 
-import json
-
-
 # BSC Mainnet token addresses (checksummed)
 MAINNET_TOKENS: dict[str, str] = {
     "BNB":      "0xbb4CdB9CBd36B01bD1cBaEBF2De08d9173bc095c",
@@ -81,10 +78,6 @@ SWAP_EXACT_TOKENS_FOR_TOKENS_ABI: list[dict] = [
     }
 ]
 
-# JSON-serialised forms for MCP tool calls
-ROUTER_ABI_JSON = json.dumps(ROUTER_ABI)
-SWAP_ABI_JSON   = json.dumps(SWAP_EXACT_TOKENS_FOR_TOKENS_ABI)
-
 # PancakeSwap v3 subgraph endpoints (tried in order)
 SUBGRAPH_ENDPOINTS: list[str] = [
     "https://api.goldsky.com/api/public/project_clk9dujce3e1f2nzgkrg13gj9/subgraphs/pancakeswap-v3-bsc/latest/gn",
@@ -2,7 +2,7 @@ import sys
 import io
 import requests
 import time
-import json
+import orjson
 
 # Force UTF-8 for Windows PowerShell
 sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
@@ -71,8 +71,8 @@ def monitor():
                     outcomes = market.get('outcomes', '[]')
                     prices = market.get('outcomePrices', '[]')
                     
-                    if isinstance(outcomes, str): outcomes = json.loads(outcomes)
-                    if isinstance(prices, str): prices = json.loads(prices)
+                    if isinstance(outcomes, str): outcomes = orjson.loads(outcomes)
+                    if isinstance(prices, str): prices = orjson.loads(prices)
                     
                     if not prices or len(prices) == 0:
                         continue
@@ -106,7 +106,7 @@ def monitor():
                         "amount": str(amount_bnb),
                         "is_simulation": SIMULATION_MODE
                     }
-                    print(f"SIGNAL:{json.dumps(signal)}", flush=True)
+                    print(f"SIGNAL:{orjson.dumps(signal).decode()}", flush=True)
                     
                     # Deep sleep after firing a trade so the terminal pauses for your demo
                     time.sleep(120) 
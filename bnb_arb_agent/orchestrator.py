@@ -1,10 +1,9 @@
 """Main orchestration loop — runs the full analysis pipeline on a timed cycle."""
 
 import time
-from datetime import datetime
 
 from agents.analysis_agent import AnalysisAgent
-from agents.decision_agent import DecisionAgent
+from agents.decision_agent import DecisionAgent, fetch_cex_prices
 from agents.ingestion_agent import DataIngestionAgent
 from agents.onchain_intelligence_agent import OnChainIntelligenceAgent
 from config import Config
@@ -26,11 +25,13 @@ def run_pipeline() -> None:
     logger.info("Starting BNB Arb Agent on %s.", network)
 
     while True:
-        cycle_start = datetime.utcnow()
+        cycle_start = time.monotonic()
+        decision.start_tick()
 
         dataframe = ingestion.run()
         texts     = (dataframe["title"] + " " + dataframe["content"]).dropna().tolist()
 
+        cex_cache     = fetch_cex_prices(config.target_tokens)
         all_decisions = []
 
         for token in config.target_tokens:
@@ -48,7 +49,7 @@ def run_pipeline() -> None:
             analysis_result = analysis.run(token_df, token)
 
             decision_result = decision.evaluate_with_intelligence(
-                analysis_result, intel_result, token
+                analysis_result, intel_result, token, cex_cache=cex_cache
             )
 
             all_decisions.append({
@@ -62,7 +63,7 @@ def run_pipeline() -> None:
         if actionable:
             logger.info("%d arbitrage opportunity/ies found this cycle.", len(actionable))
 
-        elapsed    = (datetime.utcnow() - cycle_start).seconds
+        elapsed    = int(time.monotonic() - cycle_start)
         sleep_time = max(10, config.poll_interval_seconds - elapsed)
         logger.info("Cycle complete. Next run in %ds.", sleep_time)
         time.sleep(sleep_time)
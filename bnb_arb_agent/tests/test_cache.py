@@ -0,0 +1,63 @@
+"""Unit tests for the in-process ingester cache."""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from core.cache import cached, clear_cache
+
+
+@pytest.fixture(autouse=True)
+def _empty_cache():
+    clear_cache()
+    yield
+    clear_cache()
+
+
+class Source:
+    def __init__(self, results):
+        self.calls   = 0
+        self.results = results
+
+    @cached(60)
+    def fetch(self, query="BNB"):
+        self.calls += 1
+        return list(self.results)
+
+    @cached(60, skip=2)
+    async def fetch_async(self, session, query="BNB"):
+        self.calls += 1
+        return list(self.results)
+
+
+class TestCached:
+    def test_repeat_call_is_served_from_cache(self):
+        source = Source([{"title": "a"}])
+        assert source.fetch(query="BNB") == source.fetch(query="BNB") == [{"title": "a"}]
+        assert source.calls == 1
+
+    def test_distinct_arguments_are_fetched_separately(self):
+        source = Source([{"title": "a"}])
+        source.fetch(query="BNB")
+        source.fetch(query="CAKE")
+        assert source.calls == 2
+
+    def test_entry_expires_after_ttl(self):
+        source = Source([{"title": "a"}])
+        with patch("core.cache.time.monotonic", side_effect=[0.0, 61.0, 61.0]):
+            source.fetch()
+            source.fetch()
+        assert source.calls == 2
+
+    def test_empty_result_is_not_cached(self):
+        source = Source([])
+        source.fetch()
+        source.fetch()
+        assert source.calls == 2
+
+    def test_async_key_ignores_session(self):
+        source = Source([{"title": "a"}])
+        asyncio.run(source.fetch_async(object()))
+        asyncio.run(source.fetch_async(object()))
+        assert source.calls == 1
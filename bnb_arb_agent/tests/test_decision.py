@@ -1,5 +1,7 @@
 """Units tests for the decision agent logic."""
 
+import asyncio
+
 import pytest
 from unittest.mock import MagicMock, patch
 
@@ -8,7 +10,14 @@ from agents.decision_agent import (
     _determine_action,
     _parse_gemini,
     DecisionAgent,
+    MarketPhase,
+    RiskLevel,
+    Urgency,
+    clear_cex_cache,
+    fetch_cex_prices,
 )
+from config import Config
+from core.exceptions import ConfigurationError
 
 
 class TestParseGemini:
@@ -34,39 +43,79 @@ class TestParseGemini:
 
 class TestComputeConfidence:
     def test_increases_with_momentum_phase(self):
-        base = _compute_confidence(0.0, 0.0, "LOW", False, "UNKNOWN",  "MEDIUM")
-        with_momentum = _compute_confidence(0.0, 0.0, "LOW", False, "MOMENTUM_BUILDING", "MEDIUM")
+        base = _compute_confidence(0.0, 0.0, Urgency.LOW, False, MarketPhase.UNKNOWN, RiskLevel.MEDIUM)
+        with_momentum = _compute_confidence(0.0, 0.0, Urgency.LOW, False, MarketPhase.MOMENTUM_BUILDING, RiskLevel.MEDIUM)
         assert with_momentum > base
 
     def test_decreases_with_distribution_phase(self):
-        base = _compute_confidence(0.4, 0.02, "MEDIUM", True, "UNKNOWN",       "MEDIUM")
-        dist = _compute_confidence(0.4, 0.02, "MEDIUM", True, "DISTRIBUTION_PHASE", "MEDIUM")
+        base = _compute_confidence(0.4, 0.02, Urgency.MEDIUM, True, MarketPhase.UNKNOWN, RiskLevel.MEDIUM)
+        dist = _compute_confidence(0.4, 0.02, Urgency.MEDIUM, True, MarketPhase.DISTRIBUTION_PHASE, RiskLevel.MEDIUM)
         assert dist < base
 
     def test_clamped_to_100(self):
-        score = _compute_confidence(1.0, 0.5, "HIGH", True, "MOMENTUM_BUILDING", "LOW")
+        score = _compute_confidence(1.0, 0.5, Urgency.HIGH, True, MarketPhase.MOMENTUM_BUILDING, RiskLevel.LOW)
         assert score <= 100
 
     def test_clamped_to_zero(self):
-        score = _compute_confidence(0.0, 0.0, "LOW", False, "DISTRIBUTION_PHASE", "HIGH")
+        score = _compute_confidence(0.0, 0.0, Urgency.LOW, False, MarketPhase.DISTRIBUTION_PHASE, RiskLevel.HIGH)
         assert score >= 0
 
 
 class TestDetermineAction:
     def test_hold_when_no_arb(self):
-        assert _determine_action(False, 80, 0.5, "LOW") == "HOLD"
+        assert _determine_action(False, 80, 0.5, RiskLevel.LOW) == "HOLD"
 
     def test_hold_when_low_confidence(self):
-        assert _determine_action(True, 10, 0.5, "LOW") == "HOLD"
+        assert _determine_action(True, 10, 0.5, RiskLevel.LOW) == "HOLD"
 
     def test_hold_when_high_risk_low_confidence(self):
-        assert _determine_action(True, 55, 0.5, "HIGH") == "HOLD"
+        assert _determine_action(True, 55, 0.5, RiskLevel.HIGH) == "HOLD"
 
     def test_execute_trade_at_high_confidence(self):
-        assert _determine_action(True, 75, 0.6, "LOW") == "EXECUTE_TRADE"
+        assert _determine_action(True, 75, 0.6, RiskLevel.LOW) == "EXECUTE_TRADE"
 
     def test_paper_trade_at_medium_confidence(self):
-        assert _determine_action(True, 40, 0.1, "LOW") == "PAPER_TRADE"
+        assert _determine_action(True, 40, 0.1, RiskLevel.LOW) == "PAPER_TRADE"
+
+    def test_monitor_just_above_hold_threshold(self):
+        assert _determine_action(True, 20, 0.1, RiskLevel.LOW) == "MONITOR"
+        assert _determine_action(True, 29, 0.1, RiskLevel.LOW) == "MONITOR"
+
+    def test_high_risk_trades_only_at_top_confidence(self):
+        assert _determine_action(True, 59, 0.5, RiskLevel.HIGH) == "HOLD"
+        assert _determine_action(True, 60, 0.5, RiskLevel.HIGH) == "EXECUTE_TRADE"
+
+
+class TestFetchCEXPrices:
+    def setup_method(self):
+        clear_cex_cache()
+
+    @patch("agents.decision_agent._SESSION.get")
+    def test_single_request_for_all_tokens(self, mock_get):
+        mock_get.return_value = MagicMock(
+            content=(
+                b'{"binancecoin":       {"usd": 600.0, "usd_24h_change": 1.2},'
+                b' "pancakeswap-token": {"usd": 2.5,   "usd_24h_change": -0.4}}'
+            ),
+        )
+        prices = fetch_cex_prices(["BNB", "CAKE", "ETH"])
+
+        assert mock_get.call_count == 1
+        assert "ids=binancecoin,pancakeswap-token,ethereum&" in mock_get.call_args[0][0]
+        assert prices["BNB"]  == {"price": 600.0, "change_24h": 1.2}
+        assert prices["CAKE"]["price"] == pytest.approx(2.5)
+        assert prices["ETH"]  == {"price": 0.0, "change_24h": 0.0}
+
+    @patch("agents.decision_agent._SESSION.get", side_effect=Exception("timeout"))
+    def test_returns_zero_prices_on_failure(self, _mock_get):
+        assert fetch_cex_prices(["BNB"]) == {"BNB": {"price": 0.0, "change_24h": 0.0}}
+
+    @patch("agents.decision_agent._SESSION.get")
+    def test_serves_repeat_lookups_from_cache(self, mock_get):
+        mock_get.return_value = MagicMock(content=b'{"binancecoin": {"usd": 600.0, "usd_24h_change": 0.0}}')
+        fetch_cex_prices(["BNB"])
+        assert fetch_cex_prices(["BNB"])["BNB"]["price"] == pytest.approx(600.0)
+        assert mock_get.call_count == 1
 
 
 class TestDecisionAgentIntegration:
@@ -84,9 +133,95 @@ class TestDecisionAgentIntegration:
         assert result["action"] in ("EXECUTE_TRADE", "PAPER_TRADE")
         assert result["price_diff_pct"] == pytest.approx(1.5, abs=0.01)
 
+    @patch("agents.decision_agent._cex_price", return_value={"price": 600.0, "change_24h": 0.0})
+    @patch("tools.price_fetcher.DEXPriceFetcher.get_dex_price", return_value=599.0)
+    def test_reports_unknown_labels_as_received(self, _mock_dex, _mock_cex, caplog):
+        agent    = DecisionAgent(use_testnet=False)
+        analysis = {"final_signal": 0.2, "gemini_analysis": "URGENCY: CRITICAL"}
+        intel    = {"prediction": {"predicted_phase": "SIDEWAYS", "risk_level": "EXTREME"}}
+
+        with caplog.at_level("DEBUG", logger="agents.decision_agent"):
+            result = agent.evaluate_with_intelligence(analysis, intel, "BNB")
+
+        assert (result["urgency"], result["market_phase"], result["risk_level"]) == ("CRITICAL", "SIDEWAYS", "EXTREME")
+        assert "Phase=SIDEWAYS | Risk=EXTREME" in result["reason"]
+        assert "'CRITICAL'" in caplog.text
+
     @patch("agents.decision_agent._cex_price", return_value={"price": 600.0, "change_24h": 0.0})
     @patch("tools.price_fetcher.DEXPriceFetcher.get_dex_price", return_value=0.0)
     def test_holds_when_dex_price_unavailable(self, _mock_dex, _mock_cex, mock_analysis_result):
         agent  = DecisionAgent(use_testnet=False)
         result = agent.evaluate(mock_analysis_result, "BNB")
         assert result["dex_price"] == 0.0
+
+    @patch("agents.decision_agent._cex_price", return_value={"price": 600.0, "change_24h": 0.5})
+    @patch("tools.price_fetcher.DEXPriceFetcher.get_dex_price", return_value=591.0)
+    def test_async_matches_sync_decision(self, _mock_dex, _mock_cex, mock_analysis_result, mock_intel_result):
+        agent = DecisionAgent(use_testnet=False)
+        agent._execution_agent = MagicMock()
+
+        sync_result  = agent.evaluate_with_intelligence(mock_analysis_result, mock_intel_result, "BNB")
+        async_result = asyncio.run(agent.evaluate_async(mock_analysis_result, mock_intel_result, "BNB"))
+
+        for key in ("action", "confidence_score", "price_diff_pct", "arb_confirmed"):
+            assert async_result[key] == sync_result[key]
+
+    @patch("agents.decision_agent._cex_price", return_value={"price": 600.0, "change_24h": 0.5})
+    @patch("tools.price_fetcher.DEXPriceFetcher.get_dex_price", return_value=591.0)
+    @patch("tools.price_fetcher.DEXPriceFetcher.current_block", return_value=100)
+    def test_reads_block_number_once_per_tick(self, mock_block, mock_dex, _mock_cex, mock_analysis_result):
+        agent = DecisionAgent(use_testnet=False)
+        agent.start_tick()
+        agent.evaluate(mock_analysis_result, "BNB")
+        agent.evaluate(mock_analysis_result, "CAKE")
+
+        assert mock_block.call_count == 1
+        assert [c.args[-1] for c in mock_dex.call_args_list] == [100, 100]
+
+    @patch("agents.decision_agent._cex_price", return_value={"price": 600.0, "change_24h": 0.0})
+    @patch("tools.price_fetcher.DEXPriceFetcher.get_dex_price", return_value=599.5)
+    def test_quiet_tick_skips_price_fetch(self, mock_dex, mock_cex):
+        agent = DecisionAgent(use_testnet=False)
+        quiet = {"final_signal": 0.0, "gemini_analysis": ""}
+
+        first  = agent.evaluate(quiet, "BNB")
+        second = agent.evaluate(quiet, "BNB")
+
+        assert mock_cex.call_count == 1
+        assert mock_dex.call_count == 1
+        assert second["action"] == first["action"] == "HOLD"
+        assert second["cex_price"] == first["cex_price"]
+
+    @patch("agents.decision_agent._cex_price", return_value={"price": 600.0, "change_24h": 0.0})
+    @patch("tools.price_fetcher.DEXPriceFetcher.get_dex_price", return_value=599.5)
+    @patch("tools.price_fetcher.DEXPriceFetcher.current_block", return_value=None)
+    def test_quiet_prices_are_reused_for_one_tick_only(self, _mock_block, mock_dex, mock_cex):
+        agent = DecisionAgent(use_testnet=False)
+        quiet = {"final_signal": 0.0, "gemini_analysis": ""}
+
+        for _ in range(3):
+            agent.start_tick()
+            agent.evaluate(quiet, "BNB")
+
+        assert mock_cex.call_count == 2
+        assert mock_dex.call_count == 2
+
+    @patch("agents.decision_agent._cex_price", return_value={"price": 600.0, "change_24h": 0.0})
+    @patch("tools.price_fetcher.DEXPriceFetcher.get_dex_price", return_value=599.5)
+    def test_quiet_prices_expire_without_start_tick(self, mock_dex, mock_cex):
+        agent = DecisionAgent(use_testnet=False)
+        quiet = {"final_signal": 0.0, "gemini_analysis": ""}
+
+        with patch("agents.decision_agent.time.monotonic", side_effect=[0.0, 1e6, 1e6]):
+            agent.evaluate(quiet, "BNB")
+            agent.evaluate(quiet, "BNB")
+
+        assert mock_cex.call_count == 2
+        assert mock_dex.call_count == 2
+
+
+class TestDecisionHistoryCap:
+    def test_rejects_cap_below_one(self, monkeypatch):
+        monkeypatch.setenv("DECISION_HISTORY_CAP", "0")
+        with pytest.raises(ConfigurationError):
+            Config()
@@ -0,0 +1,719 @@
+"""Unit tests for the execution agent's circuit breaker, trade log and response parsing."""
+
+import asyncio
+import contextlib
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import numpy as np
+import pytest
+
+from agents.execution_agent import BreakerState, CircuitBreaker, ExecutionAgent, MCPClient, TradeLogger, _find_tx_hash, _tail_lines
+
+
+@pytest.fixture
+def log_path(tmp_path):
+    path = tmp_path / "trade_log.jsonl"
+    with patch.object(TradeLogger, "_LOG_FILE", str(path)):
+        yield path
+
+
+class TestTradeLogger:
+    def test_appends_one_line_per_entry(self, log_path):
+        trade_logger = TradeLogger()
+        trade_logger.log({"direction": "BUY_DEX_SELL_CEX", "status": "SUCCESS"})
+        trade_logger.log({"direction": "BUY_CEX_SELL_DEX", "status": "FAILED"})
+        trade_logger.close()
+
+        lines = log_path.read_text().splitlines()
+        assert [json.loads(line)["status"] for line in lines] == ["SUCCESS", "FAILED"]
+
+    def test_writes_numpy_scalars_as_numbers(self, log_path):
+        trade_logger = TradeLogger()
+        trade_logger.log({"status": "SUCCESS", "sentiment_signal": np.float64(0.4), "confidence_score": np.int64(72)})
+        trade_logger.close()
+
+        entry = json.loads(log_path.read_text())
+        assert entry["sentiment_signal"] == 0.4
+        assert entry["confidence_score"] == 72
+
+    def test_writes_integers_wider_than_64_bits_exactly(self, log_path):
+        trade_logger = TradeLogger()
+        trade_logger.log({"status": "SUCCESS", "amount_wei": 2**256 - 1})
+        trade_logger.close()
+
+        reloaded = TradeLogger()
+        reloaded.close()
+        assert json.loads(log_path.read_text())["amount_wei"] == 2**256 - 1
+        assert reloaded.recent(1)[0]["amount_wei"] == 2**256 - 1
+
+    def test_agents_share_one_logger_per_path(self, log_path):
+        threads = threading.active_count()
+        loggers = {id(ExecutionAgent()._logger) for _ in range(5)}
+        shared  = TradeLogger.shared()
+        shared.close()
+
+        assert len(loggers) == 1
+        assert threading.active_count() <= threads + 1
+        assert TradeLogger.shared() is not shared
+        TradeLogger.shared().close()
+
+    def test_results_and_log_entries_carry_iso_timestamps(self, log_path):
+        agent  = ExecutionAgent()
+        result = agent._build_result("CAKE", "BUY_DEX_SELL_CEX", "SUCCESS", "ok", {})
+        agent._logger.log(result)
+        agent._logger.close()
+
+        assert datetime.fromisoformat(result["timestamp"]).year >= 2024
+        assert datetime.fromisoformat(result["logged_at"]) >= datetime.fromisoformat(result["timestamp"])
+
+    def test_unserialisable_entry_is_skipped_not_fatal(self, log_path):
+        trade_logger = TradeLogger()
+        trade_logger.log({"status": "FAILED", "timestamp_ns": 10**30})
+        trade_logger.log({"status": "SUCCESS"})
+        trade_logger.close()
+
+        assert [json.loads(line)["status"] for line in log_path.read_text().splitlines()] == ["SUCCESS"]
+
+    def test_writer_survives_a_failed_batch(self, log_path):
+        trade_logger = TradeLogger()
+        with patch.object(trade_logger, "_write", side_effect=[ValueError("boom"), None]) as mock_write:
+            trade_logger.log({"status": "FAILED"})
+            trade_logger.flush()
+            trade_logger.log({"status": "SUCCESS"})
+            trade_logger.flush()
+
+        assert trade_logger._writer.is_alive()
+        assert mock_write.call_count == 2
+        trade_logger.close()
+
+    def test_tail_lines_reads_backwards_across_blocks(self, log_path):
+        lines = [b"%d:%s" % (n, b"x" * (n % 7)) for n in range(200)]
+        log_path.write_bytes(b"\n".join(lines) + b"\n")
+
+        assert _tail_lines(str(log_path), 25, block_size=16) == lines[-25:]
+        assert _tail_lines(str(log_path), 500, block_size=16) == lines
+
+    def test_formats_timestamp_only_on_output(self, log_path):
+        trade_logger = TradeLogger()
+        entry = {"status": "SUCCESS", "timestamp_ns": 1_700_000_000_123_456_000}
+        trade_logger.log(entry)
+        trade_logger.close()
+
+        assert "timestamp" not in entry
+        written = json.loads(log_path.read_text())
+        assert written["timestamp"] == "2023-11-14T22:13:20.123456"
+        assert trade_logger.recent(1)[0]["timestamp"] == written["timestamp"]
+
+    def test_reloads_existing_entries_and_skips_bad_lines(self, log_path):
+        log_path.write_text('{"status": "SUCCESS"}\nnot json\n{"status": "FAILED"}\n')
+
+        trade_logger = TradeLogger()
+        trade_logger.close()
+
+        assert [r["status"] for r in trade_logger.recent()] == ["SUCCESS", "FAILED"]
+
+    def test_migrates_legacy_json_log_once(self, log_path):
+        legacy = log_path.with_suffix(".json")
+        legacy.write_text(json.dumps([{"status": "OLD", "timestamp": "2024-01-01T00:00:00"}], indent=2))
+        log_path.write_text('{"status": "NEW"}\n')
+
+        TradeLogger().close()
+        trade_logger = TradeLogger()
+        trade_logger.close()
+
+        assert [r["status"] for r in trade_logger.recent()] == ["OLD", "NEW"]
+        assert not legacy.exists()
+        assert legacy.with_suffix(".json.migrated").exists()
+
+    def test_flush_waits_for_writer_thread(self, log_path):
+        trade_logger = TradeLogger()
+        for _ in range(3):
+            trade_logger.log({"status": "SUCCESS"})
+        trade_logger.flush()
+
+        assert len(log_path.read_text().splitlines()) == 3
+        trade_logger.close()
+
+    def test_writer_flushes_batch_after_interval(self, log_path):
+        trade_logger = TradeLogger()
+        trade_logger.log({"status": "SUCCESS"})
+
+        deadline = time.monotonic() + 2
+        while not log_path.read_text() and time.monotonic() < deadline:
+            time.sleep(TradeLogger._FLUSH_SECONDS)
+        assert len(log_path.read_text().splitlines()) == 1
+        trade_logger.close()
+
+    def test_idle_writer_syncs_deferred_writes(self, log_path):
+        with patch.object(TradeLogger, "_SYNC_SECONDS", 0.1):
+            trade_logger = TradeLogger()
+            with patch.object(trade_logger, "_sync", wraps=trade_logger._sync) as sync:
+                trade_logger.log({"status": "SUCCESS"})
+                trade_logger.log({"status": "SUCCESS"})
+                time.sleep(0.3)
+                assert sync.call_count == 1
+            trade_logger.close()
+
+    def test_full_queue_drops_oldest_unwritten_entry(self, log_path):
+        trade_logger = TradeLogger()
+        trade_logger.close()
+        trade_logger._queue.maxsize = 2
+        for n in range(3):
+            trade_logger._enqueue({"n": n})
+
+        assert [trade_logger._queue.get_nowait()["n"] for _ in range(2)] == [1, 2]
+
+    def test_full_queue_never_drops_flush_events(self, log_path):
+        trade_logger = TradeLogger()
+        trade_logger.close()
+        trade_logger._queue.maxsize = 2
+        done = threading.Event()
+        trade_logger._queue.put_nowait(done)
+        trade_logger._enqueue({"n": 0})
+        with patch("agents.execution_agent.logger.warning") as warning:
+            trade_logger._enqueue({"n": 1})
+
+        assert trade_logger._queue.get_nowait() is done
+        assert trade_logger._queue.get_nowait()["n"] == 1
+        assert trade_logger._dropped == 1
+        assert "1 dropped" in warning.call_args.args[0] % warning.call_args.args[1:]
+
+    def test_keeps_only_recent_tail_in_memory(self, log_path):
+        log_path.write_text("".join(json.dumps({"n": n}) + "\n" for n in range(TradeLogger._TAIL_SIZE + 5)))
+
+        trade_logger = TradeLogger()
+        trade_logger.log({"n": "new"})
+        trade_logger.close()
+
+        assert len(trade_logger._records) == TradeLogger._TAIL_SIZE
+        assert [r["n"] for r in trade_logger.recent(2)] == [TradeLogger._TAIL_SIZE + 4, "new"]
+
+
+class TestExtractTxHash:
+    TX = "0x" + "ab12" * 16
+
+    def test_finds_hash_in_nested_json_text(self):
+        result = {"content": [{"type": "text", "text": '{"receipt": {"transactionHash": "%s"}}' % self.TX}]}
+        assert ExecutionAgent._extract_tx_hash(result) == self.TX
+
+    def test_prefers_transaction_hash_key_over_earlier_hashes(self):
+        block = "0x" + "cd" * 32
+        parsed = {"blockHash": block, "transactionHash": self.TX}
+        result = {"result": parsed, "content": [{"text": json.dumps(parsed)}]}
+        assert ExecutionAgent._extract_tx_hash(result) == self.TX
+
+    def test_falls_back_to_later_content_and_odd_shapes(self):
+        assert ExecutionAgent._extract_tx_hash({"content": [{"text": "queued"}, {"text": self.TX}]}) == self.TX
+        assert ExecutionAgent._extract_tx_hash({"content": [], "result": {"receipt": [{"hash": self.TX}]}}) == self.TX
+        assert ExecutionAgent._extract_tx_hash({"result": "no content"}) == "unknown"
+
+    def test_skips_short_hex_before_real_hash(self):
+        assert _find_tx_hash("to 0xdeadbeef then 0x0x%s" % self.TX[2:]) == self.TX
+
+    def test_parses_json_text_and_passes_plain_text_through(self):
+        assert MCPClient._try_parse_json('{"a": 1}') == {"a": 1}
+        assert MCPClient._try_parse_json(" [1, 2]") == [1, 2]
+        assert MCPClient._try_parse_json("Error: execution reverted") == "Error: execution reverted"
+        assert MCPClient._try_parse_json("not json") == "not json"
+
+    def test_keeps_wei_amounts_as_exact_integers(self):
+        assert MCPClient._try_parse_json("[123456789012345678901, %d]" % (2**256 - 1)) == [123456789012345678901, 2**256 - 1]
+
+    def test_detects_embedded_errors(self):
+        assert MCPClient._extract_embedded_error("  Error: execution reverted") == "  Error: execution reverted"
+        assert MCPClient._extract_embedded_error("Reverted: error writing to contract") is not None
+        assert MCPClient._extract_embedded_error({"message": "Transaction FAILED"}) == "Transaction FAILED"
+        assert MCPClient._extract_embedded_error({"message": "no error writing to contract"}) is None
+        assert MCPClient._extract_embedded_error({"error": None, "message": "ok"}) is None
+        assert MCPClient._extract_embedded_error("0x" + "ab" * 32) is None
+
+    def test_returns_unknown_without_hash(self):
+        assert _find_tx_hash("no hash here 0x12") is None
+        assert ExecutionAgent._extract_tx_hash({"content": [{"text": "pending"}]}) == "unknown"
+
+
+class TestCircuitBreaker:
+    @staticmethod
+    def _tripped(max_failures=2):
+        breaker = CircuitBreaker(max_failures=max_failures, cooldown_minutes=15)
+        for _ in range(max_failures):
+            breaker.record_failure()
+        return breaker
+
+    @staticmethod
+    def _expire(breaker):
+        elapsed = max(breaker._open_for, breaker._cooldown) + 1
+        breaker._tripped_at -= elapsed
+        breaker._probe_started_at -= elapsed
+
+    def test_trips_after_max_failures(self):
+        breaker = self._tripped()
+        assert breaker.status["state"] == "OPEN"
+        assert breaker.status["tripped_at"] is not None
+        assert breaker.allow_trade() is False
+
+    def test_allows_single_probe_after_cooldown(self):
+        breaker = self._tripped()
+        self._expire(breaker)
+
+        assert breaker.allow_trade() is True
+        assert breaker._state is BreakerState.HALF_OPEN
+        assert breaker.allow_trade() is False
+
+    def test_concurrent_callers_get_one_probe(self):
+        breaker = self._tripped()
+        self._expire(breaker)
+        start = threading.Barrier(8)
+
+        def attempt():
+            start.wait()
+            return breaker.allow_trade()
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            allowed = list(pool.map(lambda _: attempt(), range(8)))
+
+        assert allowed.count(True) == 1
+
+    def test_probe_success_closes_on_probation(self):
+        breaker = self._tripped(max_failures=3)
+        self._expire(breaker)
+        breaker.allow_trade()
+        breaker.record_success()
+
+        assert breaker._state is BreakerState.CLOSED
+        assert breaker.status["consecutive_failures"] == 0
+        assert breaker.status["probation"] is True
+        breaker.record_failure()
+        assert breaker._state is BreakerState.OPEN
+
+    def test_second_success_ends_probation(self):
+        breaker = self._tripped(max_failures=3)
+        self._expire(breaker)
+        breaker.allow_trade()
+        breaker.record_success()
+        breaker.record_success()
+        breaker.record_failure()
+
+        assert breaker._state is BreakerState.CLOSED
+        assert breaker.status["probation"] is False
+
+    def test_released_probe_allows_a_new_probe_at_once(self):
+        breaker = self._tripped()
+        self._expire(breaker)
+        assert breaker.allow_trade() is True
+
+        breaker.release_probe()
+        assert breaker._state is BreakerState.OPEN
+        assert breaker.allow_trade() is True
+        assert breaker._state is BreakerState.HALF_OPEN
+
+    def test_release_is_a_no_op_when_not_probing(self):
+        breaker = CircuitBreaker(max_failures=2)
+        breaker.release_probe()
+        assert breaker._state is BreakerState.CLOSED
+
+    def test_probe_failure_reopens(self):
+        breaker = self._tripped()
+        self._expire(breaker)
+        breaker.allow_trade()
+        breaker.record_failure()
+
+        assert breaker._state is BreakerState.OPEN
+        assert breaker.allow_trade() is False
+
+    def test_repeated_trips_back_off_with_jitter(self):
+        breaker = self._tripped()
+        first = breaker._open_for
+        assert 15 * 60 <= first <= 15 * 60 * 1.1
+
+        self._expire(breaker)
+        breaker.allow_trade()
+        breaker.record_failure()
+        assert 30 * 60 <= breaker._open_for <= 31.5 * 60
+
+        self._expire(breaker)
+        breaker.allow_trade()
+        breaker.record_success()
+        assert breaker._trips == 0
+
+    def test_status_snapshot_changes_only_on_transition(self):
+        breaker = CircuitBreaker(max_failures=2)
+        closed = breaker.status
+        breaker.allow_trade()
+        assert breaker.status is closed
+
+        breaker.record_failure()
+        assert breaker.status is not closed
+        assert breaker.status["consecutive_failures"] == 1
+        assert closed["consecutive_failures"] == 0
+
+    def test_abandoned_probe_is_replaced_after_cooldown(self):
+        breaker = self._tripped()
+        self._expire(breaker)
+        breaker.allow_trade()
+        self._expire(breaker)
+
+        assert breaker.allow_trade() is True
+
+
+class TestExecute:
+    TX = "0x" + "cd" * 32
+
+    @staticmethod
+    async def _fake_tool(_client, tool_name, arguments):
+        await asyncio.sleep(0)
+        if arguments.get("functionName") == "getAmountsOut":
+            return {"result": ["10000000000000000", "9000"]}
+        if tool_name == "write_contract":
+            return {"result": {"txHash": TestExecute.TX}}
+        return {"result": {"balance": "1"}}
+
+    @pytest.fixture
+    def agent(self, log_path):
+        with patch.object(MCPClient, "acall_tool", self._fake_tool), \
+             patch.object(MCPClient, "is_alive", return_value=True), \
+             patch("agents.execution_agent.audit_token", return_value=True):
+            agent = ExecutionAgent()
+            agent._wallet = "0xwallet"
+            yield agent
+            agent._logger.close()
+
+    def test_probe_without_verdict_is_released(self, agent):
+        for _ in range(agent._breaker._max_failures):
+            agent._breaker.record_failure()
+        TestCircuitBreaker._expire(agent._breaker)
+        agent._breaker._last_failure_at = float("-inf")
+
+        with patch.object(agent, "_preflight", return_value={"passed": True}), \
+             patch.object(agent, "_buy_path", return_value=None):
+            result = agent.execute_two_leg({"token": "CAKE", "price_diff_pct": 5.0})
+
+        assert result["reason"] == "Invalid swap path for token."
+        assert agent._breaker.allow_trade() is True
+
+    def test_execute_runs_buy_leg_on_mcp_loop(self, agent):
+        result = agent.execute({"token": "CAKE", "direction": "BUY_DEX_SELL_CEX", "price_diff_pct": 5.0})
+
+        assert result["status"] == "SUCCESS"
+        assert result["tx_hash"] == f"BUY:{self.TX}"
+        assert agent.trade_history[-1]["status"] == "SUCCESS"
+
+    def test_approves_only_when_allowance_is_short(self, agent):
+        writes = []
+
+        async def fake(client, tool_name, arguments):
+            if arguments.get("functionName") == "allowance":
+                return {"result": allowance}
+            if tool_name == "write_contract":
+                writes.append(arguments["functionName"])
+            return await self._fake_tool(client, tool_name, arguments)
+
+        with patch.object(MCPClient, "acall_tool", fake):
+            allowance = 10 ** 30
+            assert "tx_hash" in agent._swap_native_for_token("CAKE", 10 ** 16)
+            assert writes == ["swapExactTokensForTokens"]
+
+            writes.clear()
+            allowance = 0
+            assert "tx_hash" in agent._swap_native_for_token("CAKE", 10 ** 16)
+            assert writes == ["approve", "swapExactTokensForTokens"]
+
+    def test_sell_leg_runs_on_mcp_loop(self, agent):
+        assert agent._swap_token_for_token("CAKE", 10 ** 16) == {"tx_hash": self.TX, "amount_out_wei": 9000}
+
+    def test_below_threshold_skips_mcp_round_trips(self, agent):
+        with patch.object(MCPClient, "acall_tool") as acall, patch.object(MCPClient, "is_alive") as alive:
+            preflight = agent._preflight("CAKE", "BUY_DEX_SELL_CEX", 0.0)
+
+        assert preflight["passed"] is False
+        assert "below minimum" in preflight["reason"]
+        acall.assert_not_called()
+        alive.assert_not_called()
+
+    def test_preflight_failure_trips_breaker_count(self, agent):
+        agent._rpc_cache[("read_contract", b"{}")] = (time.monotonic(), {"result": ["1", "2"]})
+        result = agent.execute({"token": "CAKE", "direction": "BUY_DEX_SELL_CEX", "price_diff_pct": 0.0})
+
+        assert result["status"] == "PREFLIGHT_FAILED"
+        assert agent.circuit_breaker_status["consecutive_failures"] == 1
+        assert agent._rpc_cache == {}
+
+    def test_transient_balance_failure_uses_recent_good_read(self, agent):
+        async def fake(client, tool_name, arguments):
+            if tool_name == "get_native_balance":
+                return {"error": "dropped", "error_type": "transport"}
+            return await self._fake_tool(client, tool_name, arguments)
+
+        assert agent._preflight("CAKE", "BUY_DEX_SELL_CEX", 5.0)["passed"] is True
+        agent.invalidate_reads()
+        with patch.object(MCPClient, "acall_tool", fake), patch("agents.execution_agent._backoff_delay", return_value=0.0):
+            assert agent._preflight("CAKE", "BUY_DEX_SELL_CEX", 5.0)["passed"] is True
+
+            agent._balance_ok_at -= 60
+            assert "balance" in agent._preflight("CAKE", "BUY_DEX_SELL_CEX", 5.0)["reason"]
+
+    def test_trade_right_after_failure_is_skipped_uncounted(self, agent):
+        agent._breaker.record_failure()
+        with patch.object(MCPClient, "acall_tool") as acall:
+            result = agent.execute({"token": "CAKE", "direction": "BUY_DEX_SELL_CEX", "price_diff_pct": 5.0})
+
+        assert result["status"] == "PREFLIGHT_FAILED"
+        assert agent.circuit_breaker_status["consecutive_failures"] == 1
+        acall.assert_not_called()
+
+
+class TestMCPErrors:
+    @pytest.fixture
+    def agent(self, log_path):
+        agent = ExecutionAgent()
+        agent._wallet = "0xwallet"
+        yield agent
+        agent._logger.close()
+
+    @staticmethod
+    def _flaky(error_type):
+        calls = []
+
+        async def fake(_client, tool_name, arguments):
+            calls.append(tool_name)
+            if len(calls) == 1:
+                return {"error": "boom", "error_type": error_type}
+            return {"result": ["1", "2"]}
+
+        return fake, calls
+
+    def test_times_out_without_raising(self):
+        client = MCPClient("http://localhost:1")
+
+        async def slow(_self, *_args):
+            await asyncio.sleep(1)
+
+        with patch.object(MCPClient, "_call_tool_async", slow), patch.object(MCPClient, "_CALL_TIMEOUT_SECONDS", 0.01):
+            result = client.call_tool("get_native_balance", {})
+
+        assert result["error_type"] == "timeout"
+
+    def test_server_rejection_is_an_rpc_error(self):
+        from mcp.shared.exceptions import McpError
+        from mcp.types import ErrorData
+
+        client  = MCPClient("http://localhost:1")
+        session = SimpleNamespace(call_tool=AsyncMock(side_effect=McpError(ErrorData(code=-32602, message="bad args"))))
+        with patch.object(MCPClient, "_ensure_session", AsyncMock(return_value=session)):
+            result = asyncio.run(client._call_tool_async("read_contract", {}))
+
+        assert result == {"error": "bad args", "error_type": "rpc"}
+
+    def test_failed_first_connect_is_a_transport_error(self):
+        client = MCPClient("http://localhost:1")
+        with patch.object(MCPClient, "_ensure_session", AsyncMock(side_effect=ConnectionError("refused"))):
+            result = asyncio.run(client._call_tool_async("read_contract", {}))
+
+        assert result == {"error": "refused", "error_type": "transport"}
+
+    def test_dropped_session_resends_reads_but_not_writes(self):
+        import anyio
+
+        ok      = SimpleNamespace(content=[SimpleNamespace(text="[1, 2]", model_dump=lambda: {})])
+        client  = MCPClient("http://localhost:1")
+        session = SimpleNamespace(call_tool=AsyncMock(side_effect=[anyio.EndOfStream(), ok, anyio.EndOfStream()]))
+        with patch.object(MCPClient, "_ensure_session", AsyncMock(return_value=session)), \
+             patch.object(MCPClient, "_reset_session", AsyncMock()):
+            read  = asyncio.run(client._call_tool_async("read_contract", {}))
+            write = asyncio.run(client._call_tool_async("write_contract", {}))
+
+        assert read["result"] == [1, 2]
+        assert write["error_type"] == "transport"
+        assert session.call_tool.await_count == 3
+
+    def test_read_retries_transport_error_once(self, agent):
+        fake, calls = self._flaky("transport")
+        with patch.object(MCPClient, "acall_tool", fake):
+            assert agent._get_amounts_out(1, ["a", "b"]) == [1, 2]
+        assert len(calls) == 2
+
+    def test_read_gives_up_after_bounded_retries(self, agent):
+        calls = []
+
+        async def fake(_client, tool_name, arguments):
+            calls.append(tool_name)
+            return {"error": "boom", "error_type": "timeout"}
+
+        with patch.object(MCPClient, "acall_tool", fake), patch("agents.execution_agent._backoff_delay", return_value=0.0):
+            assert agent._get_amounts_out(1, ["a", "b"]) is None
+        assert len(calls) == 3
+
+    def test_read_does_not_retry_rpc_error(self, agent):
+        fake, calls = self._flaky("rpc")
+        with patch.object(MCPClient, "acall_tool", fake):
+            assert agent._get_amounts_out(1, ["a", "b"]) is None
+        assert len(calls) == 1
+
+    def test_repeated_read_is_served_from_cache(self, agent):
+        calls = []
+
+        async def fake(_client, tool_name, arguments):
+            calls.append(tool_name)
+            return {"result": ["1", "2"]}
+
+        with patch.object(MCPClient, "acall_tool", fake):
+            agent._get_amounts_out(1, ["a", "b"])
+            agent._get_amounts_out(1, ["a", "b"])
+            agent._get_amounts_out(2, ["a", "b"])
+            assert len(calls) == 2
+
+            agent._rpc_cache.clear()
+            agent._get_amounts_out(1, ["a", "b"])
+        assert len(calls) == 3
+
+
+class TestGasEstimate:
+    class _Call:
+        async def estimate_gas(self, _tx):
+            await asyncio.sleep(0.2)
+            return 50_000
+
+    class _Eth:
+        @property
+        def gas_price(self):
+            async def price():
+                await asyncio.sleep(0.2)
+                return 10 ** 9
+            return price()
+
+        def contract(self, address, abi):
+            call = TestGasEstimate._Call()
+            return SimpleNamespace(functions=SimpleNamespace(approve=lambda *_: call, swapExactTokensForTokens=lambda *_: call))
+
+    def test_legs_and_gas_price_are_fetched_concurrently(self, log_path):
+        agent = ExecutionAgent()
+        agent._wallet = "0x" + "11" * 20
+        agent._web3 = SimpleNamespace(eth=self._Eth())
+        agent._router_contract = agent._web3.eth.contract(None, None)
+        path = ["0xae13d989dac2f0debff460ac112a837c89baa7cd", "0x" + "22" * 20]
+        try:
+            start = time.monotonic()
+            gas_bnb = agent._estimate_gas_bnb(10 ** 16, path, path[::-1])
+            elapsed = time.monotonic() - start
+        finally:
+            agent._logger.close()
+
+        assert gas_bnb == pytest.approx(4 * 50_000 * 10 ** 9 / 1e18)
+        assert elapsed < 0.6
+
+    def test_two_leg_gas_estimate_is_cached_or_skipped(self, log_path):
+        agent = ExecutionAgent()
+        estimate = AsyncMock(return_value=0.0002)
+        quote = AsyncMock(return_value=[1, 2])
+        try:
+            with patch.object(agent, "_estimate_gas_bnb_async", estimate), patch.object(agent, "_get_amounts_out_async", quote):
+                for _ in range(2):
+                    assert agent._mcp.run(agent._two_leg_estimates(10 ** 16, ["a", "b"], ["b", "a"])) == [0.0002, [1, 2]]
+                assert estimate.await_count == 1
+
+                agent._gas_estimate_bnb = 0.001
+                gas_bnb, _ = agent._mcp.run(agent._two_leg_estimates(10 ** 17, ["a", "b"], ["b", "a"]))
+                assert gas_bnb == 0.001 and estimate.await_count == 1
+        finally:
+            agent._logger.close()
+
+
+class TestMCPSession:
+    @pytest.fixture
+    def fake_server(self):
+        stats = {"connects": 0, "calls": 0, "loops": set()}
+
+        @contextlib.asynccontextmanager
+        async def fake_sse(_url):
+            stats["connects"] += 1
+            yield ("read", "write")
+
+        class FakeSession:
+            def __init__(self, _read, _write):
+                pass
+
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *_exc):
+                return False
+
+            async def initialize(self):
+                pass
+
+            async def call_tool(self, _name, _arguments):
+                stats["calls"] += 1
+                stats["loops"].add(id(asyncio.get_running_loop()))
+                text = '{"ok": 1}'
+                return SimpleNamespace(content=[SimpleNamespace(text=text, model_dump=lambda: {"text": text})])
+
+        with patch("agents.execution_agent.sse_client", fake_sse), patch("agents.execution_agent.ClientSession", FakeSession):
+            yield stats
+
+    def test_reuses_one_session_across_calls(self, fake_server):
+        client = MCPClient("http://mcp.test")
+        try:
+            for _ in range(3):
+                assert client.call_tool("get_native_balance", {})["result"] == {"ok": 1}
+        finally:
+            client.close()
+
+        assert fake_server["connects"] == 1 and fake_server["calls"] == 3
+
+    def test_reconnects_after_close(self, fake_server):
+        client = MCPClient("http://mcp.test")
+        client.call_tool("get_native_balance", {})
+        client.close()
+        client.call_tool("get_native_balance", {})
+        client.close()
+
+        assert fake_server["connects"] == 2
+
+    def test_clients_share_one_event_loop(self, fake_server):
+        clients = [MCPClient("http://a.test"), MCPClient("http://b.test")]
+        try:
+            for client in clients * 2:
+                client.call_tool("get_native_balance", {})
+        finally:
+            for client in clients:
+                client.close()
+
+        assert len(fake_server["loops"]) == 1
+
+    def test_liveness_probe_result_is_cached_briefly(self):
+        client = MCPClient("http://mcp.test")
+        response = MagicMock(status_code=200)
+        response.__enter__.return_value = response
+        with patch("agents.execution_agent._PROBE_SESSION.get", return_value=response) as probe:
+            assert client.is_alive() and client.is_alive()
+            assert probe.call_count == 1
+
+            client._alive_until = 0.0
+            assert client.is_alive()
+            assert probe.call_count == 2
+
+    def test_answered_call_counts_as_liveness(self, fake_server):
+        client = MCPClient("http://mcp.test")
+        client.call_tool("get_native_balance", {})
+        client.close()
+
+        with patch("agents.execution_agent._PROBE_SESSION.get") as probe:
+            assert client.is_alive()
+        probe.assert_not_called()
+
+
+class TestSharedExecutionAgent:
+    def test_shared_agent_is_reused_per_mcp_url(self, log_path):
+        url = "http://localhost:9"
+        try:
+            first = ExecutionAgent.shared(url)
+            assert ExecutionAgent.shared(url) is first
+            assert first._breaker is ExecutionAgent.shared(url)._breaker
+        finally:
+            ExecutionAgent._instances.pop(url)._logger.close()
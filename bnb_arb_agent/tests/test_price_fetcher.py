@@ -47,3 +47,28 @@ class TestGetDEXPriceFallbackOrder:
     def test_returns_zero_when_all_sources_fail(self, _mock_router, _mock_subgraph):
         fetcher = DEXPriceFetcher(use_testnet=False)
         assert fetcher.get_dex_price("BNB") == 0.0
+
+
+class TestGetDEXPriceBlockCache:
+    @patch.object(DEXPriceFetcher, "_price_from_subgraph", return_value=614.0)
+    def test_reuses_price_within_same_block(self, mock_subgraph):
+        fetcher = DEXPriceFetcher(use_testnet=False)
+        fetcher.get_dex_price("BNB", block=100)
+        assert fetcher.get_dex_price("BNB", block=100) == pytest.approx(614.0)
+        assert mock_subgraph.call_count == 1
+
+    @patch.object(DEXPriceFetcher, "_price_from_subgraph", return_value=614.0)
+    def test_refetches_on_new_block(self, mock_subgraph):
+        fetcher = DEXPriceFetcher(use_testnet=False)
+        fetcher.get_dex_price("BNB", block=100)
+        fetcher.get_dex_price("BNB", block=101)
+        assert mock_subgraph.call_count == 2
+
+    @patch.object(DEXPriceFetcher, "_price_from_subgraph", return_value=614.0)
+    def test_lookup_without_block_makes_no_block_rpc(self, mock_subgraph):
+        fetcher = DEXPriceFetcher(use_testnet=False)
+        with patch.object(fetcher, "current_block") as mock_block:
+            fetcher.get_dex_price("BNB")
+            fetcher.get_dex_price("BNB")
+        mock_block.assert_not_called()
+        assert mock_subgraph.call_count == 2
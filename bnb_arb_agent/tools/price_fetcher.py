@@ -59,14 +59,41 @@ class DEXPriceFetcher:
         rpc    = BSC_TESTNET_RPC if use_testnet else BSC_MAINNET_RPC
         router = PANCAKE_V2_ROUTER_TESTNET if use_testnet else PANCAKE_V2_ROUTER_MAINNET
 
-        web3 = Web3(Web3.HTTPProvider(rpc))
-        self._router = web3.eth.contract(
+        self._web3   = Web3(Web3.HTTPProvider(rpc))
+        self._router = self._web3.eth.contract(
             address=Web3.to_checksum_address(router),
             abi=ROUTER_ABI,
         )
+        # symbol -> (block number, price); a DEX price cannot move within a block.
+        self._price_cache: dict[str, tuple[int, float]] = {}
 
-    def get_dex_price(self, symbol: str) -> float:
-        """Return the DEX price in USD for *symbol*, or 0.0 if unavailable."""
+    def clear_cache(self) -> None:
+        self._price_cache.clear()
+
+    def get_dex_price(self, symbol: str, block: int | None = None) -> float:
+        """Return the DEX price in USD for *symbol*, or 0.0 if unavailable.
+
+        When the caller passes the current *block* (see current_block()), a price
+        already fetched in that block is reused; without one every call fetches.
+        """
+        cached = self._price_cache.get(symbol)
+        if block is not None and cached and cached[0] == block:
+            return cached[1]
+
+        price = self._fetch_dex_price(symbol)
+        if block is not None and price > 0:
+            self._price_cache[symbol] = (block, price)
+        return price
+
+    def current_block(self) -> int | None:
+        """Latest block number, or None if the RPC is unavailable. Fetch once per tick."""
+        try:
+            return self._web3.eth.block_number
+        except Exception as exc:
+            logger.debug("Block number lookup failed: %s", exc)
+            return None
+
+    def _fetch_dex_price(self, symbol: str) -> float:
         price = self._price_from_subgraph(symbol)
         if price > 0:
             logger.info("DEX price for %s from subgraph: $%.4f", symbol, price)